@@ -1,4 +1,7 @@
 """AoC 2023 day 1."""
+from streams import Source, as_text_stream
+
+ANSWERS = (53921, 54676)  # of Day01_input.txt
 
 # lookup table for digits as text, with corresponding values.
 text_to_int = {"one": 1,
@@ -58,22 +61,35 @@ def get_line_values(line: str) -> tuple[int, int]:
 	return 10 * first_digit + last_digit, 10 * first_any + last_any
 
 
-def solve() -> None:
-	"""Solve the problems, print the solutions and - if solutions are already
-	known - verify the solutions."""
+def parse(source: Source) -> list[str]:
+	"""Return the lines of the input."""
+	
+	return as_text_stream(source).readlines()
+
+
+def solve_parsed(lines: list[str]) -> tuple[int, int]:
+	"""Return the solutions for the parsed input."""
 	
 	solution_1 = 0
 	solution_2 = 0
 
+	for line in lines:
+		part_1_value, part_2_value = get_line_values(line)
+		solution_1 += part_1_value
+		solution_2 += part_2_value
+	
+	return solution_1, solution_2
+
+
+def solve() -> None:
+	"""Solve the problems, print the solutions and - if solutions are already
+	known - verify the solutions."""
+	
 	with open(f"Day01_input.txt") as input_file:
-		
-		for line in input_file:
-			part_1_value, part_2_value = get_line_values(line)
-			solution_1 += part_1_value
-			solution_2 += part_2_value
+		solution_1, solution_2 = solve_parsed(parse(input_file))
 			
 	print(solution_1, solution_2)
-	assert (solution_1, solution_2) == (53921, 54676)   # verify
+	assert (solution_1, solution_2) == ANSWERS   # verify
 
 
 if __name__ == "__main__":
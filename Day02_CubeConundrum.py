@@ -1,35 +1,59 @@
 """AoC 2023 Day 2"""
+from re import compile as re_compile
+from typing import TypeAlias
 
-from re import findall
+from streams import Source, as_text_stream
 
+Game: TypeAlias = tuple[int, ...]   # max nr of cubes shown, per color
 
-def solve() -> None:
-	"""Solve the problems, print the solutions and - if solutions are already
-	known - verify the solutions."""
+PARSER_VERSION = 1  # bump if parse() output changes (see parse_cache.py)
+ANSWERS = (1931, 83105)  # of Day02_input.txt
+
+max_allowed = {"red": 12, "green": 13, "blue": 14}
+# noinspection RegExpAnonymousGroup
+color_patterns = tuple(re_compile(rf"(\d+) {color}")
+                       for color in max_allowed)
+
+
+def parse(source: Source) -> list[Game]:
+	"""Return for each game the max nr of cubes shown per color (in the order
+	of max_allowed)."""
+	
+	return [tuple(max(map(int, pattern.findall(line)))
+	              for pattern in color_patterns)
+	        for line in as_text_stream(source)]
+
+
+def solve_parsed(games: list[Game]) -> tuple[int, int]:
+	"""Return the solutions for the parsed input."""
 	
-	max_allowed = {"red": 12, "green": 13, "blue": 14}
-	colors = tuple(max_allowed.keys())
 	solution_1 = 0
 	solution_2 = 0
 	
-	with (open(f"Day02_input.txt") as input_file):
+	for game_nr, game in enumerate(games, start=1):
+
+		game_valid = True
+		game_power = 1
+		
+		for max_found, allowed in zip(game, max_allowed.values()):
+			game_valid = game_valid and max_found <= allowed
+			game_power *= max_found
+
+		solution_1 += game_nr * game_valid
+		solution_2 += game_power
 	
-		for game_nr, line in enumerate(input_file, start=1):
+	return solution_1, solution_2
 
-			game_valid = True
-			game_power = 1
-			
-			for color in colors:
-				# noinspection RegExpAnonymousGroup
-				max_found = max(map(int, findall(rf"(\d+) {color}", line)))
-				game_valid = game_valid and max_found <= max_allowed[color]
-				game_power *= max_found
-
-			solution_1 += game_nr * game_valid
-			solution_2 += game_power
+
+def solve() -> None:
+	"""Solve the problems, print the solutions and - if solutions are already
+	known - verify the solutions."""
+	
+	with (open(f"Day02_input.txt") as input_file):
+		solution_1, solution_2 = solve_parsed(parse(input_file))
 			
 	print(solution_1, solution_2)
-	assert (solution_1, solution_2) == (1931, 83105)
+	assert (solution_1, solution_2) == ANSWERS
 
 
 if __name__ == "__main__":
@@ -1,13 +1,20 @@
 """AoC 2023 Day 3"""
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from math import prod
-from re import finditer
+from re import compile as re_compile
 from typing import TypeAlias
 
+from grid import Grid
+from instrument import count, phase
+from streams import Source, as_text_stream
+
 Coordinate: TypeAlias = tuple[int, int]
 
+PARSER_VERSION = 1  # bump if parse() output changes (see parse_cache.py)
+ANSWERS = (527369, 73074886)  # of Day03_input.txt
+
 
-@dataclass
+@dataclass(slots=True)
 class NumberInfo:
 	"""A number has a value and a flag indicating (after processing) if it is a
 	part nr."""
@@ -16,7 +23,7 @@ class NumberInfo:
 	is_part: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class SymbolInfo:
 	"""A symbol consists of a string - like '*' - and a list of all connected
 	part numbers, used to determine if it is a gear nr."""
@@ -25,24 +32,35 @@ class SymbolInfo:
 	part_nrs: list[int]
 	
 	
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RowColRanges:
 	"""This is used as key in the numbers table. The row_range and col_range
 	are (ordered and consecutive) row nrs and col nrs that must be checked to
-	determine if a number is a part nr."""
+	determine if a number is a part nr. Frozen, so the hash can be calculated
+	once instead of on every dict lookup."""
 	
 	row_range: tuple[int, ...]
 	col_range: tuple[int, ...]
+	_hash: int = field(init=False, repr=False, compare=False)
+	
+	def __post_init__(self) -> None:
+		object.__setattr__(self, "_hash",
+		                   hash((self.row_range, self.col_range)))
 	
 	def __hash__(self) -> int:
 		"""Must provide hash func, since dict key must be hashable."""
 		
-		return hash((self.row_range, self.col_range))
+		return self._hash
 
 
 NumbersDict: TypeAlias = dict[RowColRanges, NumberInfo]
 SymbolsDict: TypeAlias = dict[Coordinate, SymbolInfo]
 
+symbol_pattern = re_compile(r"[^.0-9\n]")
+number_pattern = re_compile(r"[0-9]+")
+number_bytes_pattern = re_compile(rb"[0-9]+")
+not_symbol_bytes = frozenset(b".0123456789\r\n")
+
 
 def add_symbols(line: str, line_nr: int, symbols: SymbolsDict) -> None:
 	"""Add an entry to the symbols table for all nrs online. Each entry has a
@@ -50,7 +68,7 @@ def add_symbols(line: str, line_nr: int, symbols: SymbolsDict) -> None:
 	char (the symbol) and an empty list (to store adjacent nrs, if any, during
 	processing)."""
 
-	matches = finditer(r"[^.0-9\n]", line)
+	matches = symbol_pattern.finditer(line)
 	for match in matches:
 		coordinate = line_nr, match.start()
 		symbol = match.string[match.start():match.end()]
@@ -64,7 +82,7 @@ def add_numbers(line: str, line_nr: int, numbers: NumbersDict) -> None:
 	deciding if the number is a part number. The value is a NumberInfo object
 	storing the value and a flag for storing whether it's a part number."""
 
-	matches = finditer(r"[0-9]+", line)
+	matches = number_pattern.finditer(line)
 	for match in matches:
 		
 		rows_range = line_nr - 1, line_nr, line_nr + 1
@@ -81,30 +99,64 @@ def process_tables(numbers: NumbersDict, symbols: SymbolsDict) -> None:
 	2. add number to symbol's adjacent numbers if symbol = '*' (all symbol's
 	   with exactly two adjacent numbers are gears)."""
 
+	count("process_tables numbers", len(numbers))
+
 	for number_key, number_info in numbers.items():
 
 		for row in number_key.row_range:
 			for col in number_key.col_range:
 				if symbol_info := symbols.get((row, col)):
-					numbers[number_key].is_part = True
+					number_info.is_part = True
 					if symbol_info.symbol == "*":
 						symbol_info.part_nrs.append(number_info.value)
 
 
-def solve() -> None:
-	"""Solve the problems, print the solutions and - if solutions are already
-	known - verify the solutions."""
+def parse(source: Source) -> tuple[NumbersDict, SymbolsDict]:
+	"""Return the numbers and symbols tables for the schematic, already
+	processed (part nrs marked, part nrs added to '*' symbols)."""
 
 	numbers: NumbersDict = dict()
 	symbols: SymbolsDict = dict()
 
-	with (open(f"Day03_input.txt") as input_file):
-
-		for line_nr, line in enumerate(input_file):
-			add_symbols(line, line_nr, symbols)
-			add_numbers(line, line_nr, numbers)
+	for line_nr, line in enumerate(as_text_stream(source)):
+		add_symbols(line, line_nr, symbols)
+		add_numbers(line, line_nr, numbers)
 	
-	process_tables(numbers, symbols)
+	with phase("process_tables"):
+		process_tables(numbers, symbols)
+	
+	return numbers, symbols
+
+
+PackedTables: TypeAlias = tuple[
+	list[tuple[tuple[int, ...], tuple[int, ...], int, bool]],
+	list[tuple[int, int, str, list[int]]]]
+
+
+def pack(tables: tuple[NumbersDict, SymbolsDict]) -> PackedTables:
+	"""Return the parsed tables as plain (marshallable) lists of tuples."""
+
+	numbers, symbols = tables
+	return ([(key.row_range, key.col_range, info.value, info.is_part)
+	         for key, info in numbers.items()],
+	        [(row, col, info.symbol, info.part_nrs)
+	         for (row, col), info in symbols.items()])
+
+
+def unpack(packed: PackedTables) -> tuple[NumbersDict, SymbolsDict]:
+	"""Return the parsed tables from their packed form."""
+
+	packed_numbers, packed_symbols = packed
+	return ({RowColRanges(row_range, col_range): NumberInfo(value, is_part)
+	         for row_range, col_range, value, is_part in packed_numbers},
+	        {(row, col): SymbolInfo(symbol, part_nrs)
+	         for row, col, symbol, part_nrs in packed_symbols})
+
+
+def solve_parsed(tables: tuple[NumbersDict, SymbolsDict]) -> tuple[int, int]:
+	"""Return the solutions for the parsed input."""
+
+	numbers, symbols = tables
 	
 	solution_1 = sum(number_info.value
 	                 for number_info in numbers.values()
@@ -114,8 +166,232 @@ def solve() -> None:
 	                 if symbol_info.symbol == "*"
 	                 and len(symbol_info.part_nrs) == 2)
 
+	return solution_1, solution_2
+
+
+@dataclass(slots=True, eq=False)
+class SchematicNumber:
+	"""A number in an (editable) Schematic: on row, from col start up to col
+	end, and the nr of symbols adjacent to it (a part nr if > 0). Compared
+	by identity, so it can be stored in the adjacency sets of gears."""
+
+	row: int
+	start: int
+	end: int
+	value: int
+	nr_symbols: int = 0
+
+
+class Schematic:
+	"""An editable schematic that keeps both solutions current. Every digit
+	cell refers to its number and every '*' to the set of its adjacent
+	numbers, so set_cell only revisits the cell's 3x3 neighbourhood (and the
+	numbers on its row touching the cell)."""
+
+	def __init__(self, lines: list[str]) -> None:
+		self.cells = [list(line.rstrip("\n")) for line in lines]
+		self.number_at: dict[Coordinate, SchematicNumber] = {}
+		self.gears: dict[Coordinate, set[SchematicNumber]] = {}
+		self.part_nrs_sum = 0
+		self.gear_ratios_sum = 0
+
+		for row, line in enumerate(self.cells):
+			for col, char in enumerate(line):
+				if is_symbol(char):
+					self._add_symbol(row, col, char)
+		for row, line in enumerate(self.cells):
+			for match in number_pattern.finditer("".join(line)):
+				self._add_number(row, match.start(), match.end())
+
+	@classmethod
+	def from_source(cls, source: Source) -> "Schematic":
+		"""Return the schematic read from source."""
+
+		return cls(as_text_stream(source).readlines())
+
+	@property
+	def solutions(self) -> tuple[int, int]:
+		"""Return the sum of all part nrs and the sum of all gear ratios."""
+
+		return self.part_nrs_sum, self.gear_ratios_sum
+
+	def get_cell(self, row: int, col: int) -> str:
+		"""Return the char at row, col."""
+
+		return self.cells[row][col]
+
+	def set_cell(self, row: int, col: int, char: str) -> None:
+		"""Replace the char at row, col by char and update the solutions."""
+
+		if len(char) != 1 or char == "\n":
+			raise ValueError(f"not a single schematic char: {char!r}")
+		old_char = self.cells[row][col]
+		if char == old_char:
+			return
+
+		if is_symbol(old_char):
+			self._remove_symbol(row, col, old_char)
+
+		if changes_digits := old_char.isdigit() or char.isdigit():
+			# numbers touching col may grow, shrink, merge or split.
+			touching = {number for c in (col - 1, col, col + 1)
+			            if (number := self.number_at.get((row, c)))}
+			start = min([col, *(number.start for number in touching)])
+			end = max([col + 1, *(number.end for number in touching)])
+			for number in touching:
+				self._remove_number(number)
+
+		self.cells[row][col] = char
+
+		# symbols before numbers: a new number links to all its symbols.
+		if is_symbol(char):
+			self._add_symbol(row, col, char)
+
+		if changes_digits:
+			# only the changed span, so an edit costs O(1), not O(row).
+			span = "".join(self.cells[row][start:end])
+			for match in number_pattern.finditer(span):
+				self._add_number(row, start + match.start(),
+				                 start + match.end())
+
+	def _get_adjacent_numbers(self, row: int, col: int) \
+		-> set[SchematicNumber]:
+		"""Return the numbers with a digit in the 3x3 block around row,
+		col."""
+
+		return {number for r in (row - 1, row, row + 1)
+		        for c in (col - 1, col, col + 1)
+		        if (number := self.number_at.get((r, c)))}
+
+	def _update_gear(self, coordinate: Coordinate, number: SchematicNumber,
+	                 add: bool) -> None:
+		"""Add number to (or remove it from) the adjacent numbers of the '*'
+		at coordinate, updating the sum of gear ratios."""
+
+		adjacent = self.gears[coordinate]
+		self.gear_ratios_sum -= get_gear_ratio(adjacent)
+		if add:
+			adjacent.add(number)
+		else:
+			adjacent.discard(number)
+		self.gear_ratios_sum += get_gear_ratio(adjacent)
+
+	def _add_number(self, row: int, start: int, end: int) -> None:
+		"""Add the number at row, from start up to end, and link it to the
+		adjacent symbols."""
+
+		value = int("".join(self.cells[row][start:end]))
+		number = SchematicNumber(row, start, end, value)
+		for col in range(start, end):
+			self.number_at[row, col] = number
+
+		for r in (row - 1, row, row + 1):
+			if not 0 <= r < len(self.cells):
+				continue
+			line = self.cells[r]
+			for c in range(max(start - 1, 0), min(end + 1, len(line))):
+				if is_symbol(line[c]):
+					number.nr_symbols += 1
+					if line[c] == "*":
+						self._update_gear((r, c), number, add=True)
+
+		if number.nr_symbols:
+			self.part_nrs_sum += value
+
+	def _remove_number(self, number: SchematicNumber) -> None:
+		"""Remove number and unlink it from the adjacent gears."""
+
+		for col in range(number.start, number.end):
+			del self.number_at[number.row, col]
+		for r in (number.row - 1, number.row, number.row + 1):
+			for c in range(number.start - 1, number.end + 1):
+				if (r, c) in self.gears:
+					self._update_gear((r, c), number, add=False)
+		if number.nr_symbols:
+			self.part_nrs_sum -= number.value
+
+	def _add_symbol(self, row: int, col: int, char: str) -> None:
+		"""Mark the numbers adjacent to the symbol at row, col as part nrs
+		and, for a '*', store them as its adjacent numbers."""
+
+		adjacent = self._get_adjacent_numbers(row, col)
+		for number in adjacent:
+			number.nr_symbols += 1
+			if number.nr_symbols == 1:
+				self.part_nrs_sum += number.value
+		if char == "*":
+			self.gears[row, col] = adjacent
+			self.gear_ratios_sum += get_gear_ratio(adjacent)
+
+	def _remove_symbol(self, row: int, col: int, char: str) -> None:
+		"""Undo _add_symbol for the symbol at row, col."""
+
+		for number in self._get_adjacent_numbers(row, col):
+			number.nr_symbols -= 1
+			if number.nr_symbols == 0:
+				self.part_nrs_sum -= number.value
+		if char == "*":
+			self.gear_ratios_sum -= get_gear_ratio(self.gears.pop((row, col)))
+
+
+def is_symbol(char: str) -> bool:
+	"""Return True if char is a symbol (not a '.', digit or newline)."""
+
+	return symbol_pattern.match(char) is not None
+
+
+def get_gear_ratio(adjacent: set[SchematicNumber]) -> int:
+	"""Return the gear ratio of a '*' with the adjacent numbers (0 if it is
+	not a gear)."""
+
+	if len(adjacent) != 2:
+		return 0
+	first, second = adjacent
+	return first.value * second.value
+
+
+def solve_incremental(source: Source) -> tuple[int, int]:
+	"""Return the solutions using an (editable) Schematic."""
+
+	return Schematic.from_source(source).solutions
+
+
+def solve_grid(source: Source) -> tuple[int, int]:
+	"""Return the solutions, scanning the numbers in a Grid and checking the
+	cells around each number for symbols."""
+
+	part_nrs_sum = 0
+	gears: dict[Coordinate, list[int]] = {}
+
+	with Grid.from_source(source) as grid:
+		for match in number_bytes_pattern.finditer(grid.buffer):
+			row, start = grid.get_coordinate(match.start())
+			value = int(match[0])
+			is_part = False
+			for coordinate in grid.around(row, start, start + len(match[0])):
+				if (cell := grid[coordinate]) not in not_symbol_bytes:
+					is_part = True
+					if cell == ord("*"):
+						gears.setdefault(coordinate, []).append(value)
+			if is_part:
+				part_nrs_sum += value
+
+	return part_nrs_sum, sum(prod(part_nrs) for part_nrs in gears.values()
+	                         if len(part_nrs) == 2)
+
+
+BACKENDS = {"incremental": solve_incremental, "grid": solve_grid}
+
+
+def solve() -> None:
+	"""Solve the problems, print the solutions and - if solutions are already
+	known - verify the solutions."""
+
+	with (open(f"Day03_input.txt") as input_file):
+		solution_1, solution_2 = solve_parsed(parse(input_file))
+
 	print(solution_1, solution_2)
-	assert (solution_1, solution_2) == (527369, 73074886)
+	assert (solution_1, solution_2) == ANSWERS
 
 
 if __name__ == "__main__":
@@ -1,8 +1,12 @@
 """AoC 2023 Day 4"""
-from collections import defaultdict
-from re import findall
+from re import compile as re_compile
 
-nr_card_copies: dict[int, int] = defaultdict(lambda: 1)
+from streams import Source, as_text_stream
+
+number_pattern = re_compile(r"[0-9]+")
+
+PARSER_VERSION = 1  # bump if parse() output changes (see parse_cache.py)
+ANSWERS = (22674, 5747443)  # of Day04_input.txt
 
 
 def nr_of_winning_nrs(line: str) -> int:
@@ -10,34 +14,45 @@ def nr_of_winning_nrs(line: str) -> int:
 	
 	winning_part, my_part = line.split(": ")[1].split(" | ")
 	
-	winning_nrs = set(map(int, findall(r"[0-9]+", winning_part)))
-	my_nrs = set(map(int, findall(r"[0-9]+", my_part)))
+	winning_nrs = set(map(int, number_pattern.findall(winning_part)))
+	my_nrs = set(map(int, number_pattern.findall(my_part)))
 	
 	return len(winning_nrs.intersection(my_nrs))
 
 
+def parse(source: Source) -> list[int]:
+	"""Return the nr of winning numbers for each card."""
+	
+	return [nr_of_winning_nrs(line) for line in as_text_stream(source)]
+
+
+def solve_parsed(nrs_of_wins: list[int]) -> tuple[int, int]:
+	"""Return the solutions for the parsed input."""
+
+	solution_1 = 0
+	nr_card_copies = [1] * len(nrs_of_wins)
+	
+	for card_index, nr_wins in enumerate(nrs_of_wins):
+		if nr_wins > 0:
+			solution_1 += 1 << (nr_wins - 1)
+			nr_copies = nr_card_copies[card_index]
+			# copies of cards beyond the last card are not counted.
+			for i in range(card_index + 1,
+			               min(card_index + nr_wins + 1, len(nrs_of_wins))):
+				nr_card_copies[i] += nr_copies
+
+	return solution_1, sum(nr_card_copies)
+
+
 def solve() -> None:
 	"""Solve the problems, print the solutions and - if solutions are already
 	known - verify the solutions."""
 
-	solution_1 = 0
-	
 	with (open(f"Day04_input.txt") as input_file):
-		
-		for line_nr, line in enumerate(input_file, start=1):
-			# make sure nr_card_copies[line_nr] is set to 1 if no value yet.
-			nr_copies = nr_card_copies[line_nr]
-			nr_wins = nr_of_winning_nrs(line)
-
-			if nr_wins > 0:
-				solution_1 += 1 << (nr_wins - 1)
-				for i in range(1, nr_wins + 1):
-					nr_card_copies[line_nr + i] += nr_copies
-
-	solution_2 = sum(v for (k, v) in nr_card_copies.items() if k <= line_nr)
+		solution_1, solution_2 = solve_parsed(parse(input_file))
 	
 	print(solution_1, solution_2)
-	assert (solution_1, solution_2) == (22674, 5747443)
+	assert (solution_1, solution_2) == ANSWERS
 
 
 if __name__ == "__main__":
@@ -1,9 +1,18 @@
 """AoC 2023 Day 5"""
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
-from re import findall
-from typing import TextIO
+from re import compile as re_compile
+from typing import TextIO, TypeAlias
+
+from instrument import count, phase
+from streams import Source, as_text_stream
+
+number_pattern = re_compile(r"[0-9]+")
+
+PARSER_VERSION = 1  # bump if parse() output changes (see parse_cache.py)
+ANSWERS = (910845529, 77435348)  # of Day05_input.txt
 
 
 # todo: This could be done slightly more efficient if you use a bisect (a list
@@ -15,7 +24,7 @@ from typing import TextIO
 #       in trouble iterating over a list that's modified inside the loop. Also
 #       you'd have to put the resulting destination intervals in a bisect list.
 
-@dataclass(order=True)
+@dataclass(order=True, slots=True)
 class Interval:
 	"""An Interval is bounded by a first and last integer. These and all
 	integers in between are in the interval."""
@@ -24,7 +33,7 @@ class Interval:
 	last: int
 
 
-@dataclass(order=True)
+@dataclass(order=True, slots=True)
 class MapLine:
 	"""A map line has an interval and an offset (by which to adjust all sources
 	that fall within the interval)."""
@@ -41,6 +50,12 @@ class Map:
 		"""map lines MUST be sorted ascending!"""
 		map_lines.sort()
 		self.map_lines = map_lines
+		self._firsts = [map_line.interval.first for map_line in map_lines]
+		self._by_destination = sorted(
+			(map_line.interval.first + map_line.offset, map_line)
+			for map_line in map_lines)
+		self._destination_firsts = [first for first, _
+		                            in self._by_destination]
 	
 	@staticmethod
 	def _get_before(interval: Interval, map_interval: Interval) \
@@ -128,6 +143,65 @@ class Map:
 		
 		return destination_intervals
 	
+	def split(self, interval: Interval) \
+		-> list[tuple[Interval, MapLine | None]]:
+		"""Return interval split in (ascending) parts, each with the map line
+		that converts it (None for a part not in any map line)."""
+
+		parts: list[tuple[Interval, MapLine | None]] = []
+		position = interval.first
+		index = max(bisect_right(self._firsts, position) - 1, 0)
+
+		for map_line in self.map_lines[index:]:
+			line_interval = map_line.interval
+			if line_interval.first > interval.last:
+				break
+			if line_interval.last < position:
+				continue
+			if position < line_interval.first:
+				parts.append((Interval(position, line_interval.first - 1),
+				              None))
+				position = line_interval.first
+			last = min(line_interval.last, interval.last)
+			parts.append((Interval(position, last), map_line))
+			position = last + 1
+			if position > interval.last:
+				break
+
+		if position <= interval.last:
+			parts.append((Interval(position, interval.last), None))
+		return parts
+
+	def invert_intervals(self, destination_intervals: list[Interval]) \
+		-> list[Interval]:
+		"""Return a list of all source intervals that convert to (a part of)
+		destination_intervals: the inverse of convert_intervals."""
+
+		source_intervals: list[Interval] = []
+
+		for interval in destination_intervals:
+			# sources not in any map line convert to themselves, ...
+			source_intervals.extend(part for part, map_line
+			                        in self.split(interval) if not map_line)
+			# ... others are the map lines' destinations, shifted back. The
+			# destinations are disjoint: only the one before interval.first
+			# may end before it.
+			by_destination = self._by_destination
+			index = max(bisect_right(self._destination_firsts,
+			                         interval.first) - 1, 0)
+			while index < len(by_destination):
+				first, map_line = by_destination[index]
+				if first > interval.last:
+					break
+				last = map_line.interval.last + map_line.offset
+				if last >= interval.first:
+					source_intervals.append(
+						Interval(max(first, interval.first) - map_line.offset,
+						         min(last, interval.last) - map_line.offset))
+				index += 1
+
+		return source_intervals
+
 	def _get_destination(self, source: int) -> int:
 		"""Return the destination of the source."""
 		
@@ -156,7 +230,7 @@ def get_map_lines(input_file: TextIO) -> Map | None:
 	map_lines = []
 	
 	while len(line := input_file.readline()) > 1:
-		destination, first, length = map(int, findall(r"[0-9]+", line))
+		destination, first, length = map(int, number_pattern.findall(line))
 		interval = Interval(first, first + length - 1)
 		map_lines.append(MapLine(interval, destination - first))
 
@@ -172,26 +246,163 @@ def get_seed_intervals(seed_nrs: list[int]) -> list[Interval]:
 	                  for (start, length) in seeds_as_start_length]
 
 
-def solve() -> None:
-	"""Solve the problems, print the solutions and - if solutions are already
-	known - verify the solutions."""
+Almanac: TypeAlias = tuple[list[int], list[Map]]   # seed nrs and maps
+
+
+def parse(source: Source) -> Almanac:
+	"""Return the seed nrs and the maps (in order of conversion)."""
+
+	input_file = as_text_stream(source)
+	seed_nrs = [*map(int, number_pattern.findall(input_file.readline()))]
+	input_file.readline()  # skip empty conversion_interval
+
+	maps = []
+	while map_lines := get_map_lines(input_file):
+		maps.append(map_lines)
 	
-	with (open(f"Day05_input.txt") as input_file):
+	return seed_nrs, maps
 
-		source_nrs = [*map(int, findall(r"[0-9]+", input_file.readline()))]
-		source_intervals = get_seed_intervals(source_nrs)
 
-		input_file.readline()  # skip empty conversion_interval
-		
-		while map_lines := get_map_lines(input_file):
-			source_nrs = map_lines.convert_nrs(source_nrs)
+class ChainIndex:
+	"""The conversion by all maps (seed to location) as sorted segments: seeds
+	first ... last convert to first + offset ... last + offset. Segments
+	cover all seeds 0 ... SEED_LIMIT - 1. A second list, sorted by location,
+	answers which seeds reach low locations, and a table of minima over runs
+	of 2^k segments gives the lowest location of a seed range in O(log n)."""
+
+	SEED_LIMIT = 1 << 64
+
+	def __init__(self, maps: list[Map]) -> None:
+		segments = [(Interval(0, self.SEED_LIMIT - 1), 0)]
+
+		for map_lines in maps:
+			next_segments = []
+			for seeds, offset in segments:
+				sources = Interval(seeds.first + offset, seeds.last + offset)
+				for part, map_line in map_lines.split(sources):
+					next_segments.append(
+						(Interval(part.first - offset, part.last - offset),
+						 offset + (map_line.offset if map_line else 0)))
+			segments = next_segments
+
+		self.segments = segments
+		self._firsts = [seeds.first for seeds, _ in segments]
+		self._by_location = sorted((seeds.first + offset, seeds, offset)
+		                           for seeds, offset in segments)
+		self._location_firsts = [first for first, _, _ in self._by_location]
+
+		self._minima = [[seeds.first + offset for seeds, offset in segments]]
+		width = 1
+		while 2 * width <= len(segments):
+			previous = self._minima[-1]
+			self._minima.append([min(previous[i], previous[i + width])
+			                     for i in range(len(previous) - width)])
+			width *= 2
+
+	def _get_segment_index(self, seed: int) -> int:
+		"""Return the index of the segment holding seed."""
+
+		if not 0 <= seed < self.SEED_LIMIT:
+			raise ValueError(f"seed {seed} out of range")
+		return bisect_right(self._firsts, seed) - 1
+
+	def _get_min_of_segments(self, start: int, stop: int) -> int:
+		"""Return the lowest location of the segments start ... stop - 1."""
+
+		level = (stop - start).bit_length() - 1
+		minima = self._minima[level]
+		return min(minima[start], minima[stop - (1 << level)])
+
+	def get_location(self, seed: int) -> int:
+		"""Return the location for seed."""
+
+		return seed + self.segments[self._get_segment_index(seed)][1]
+
+	def get_min_location(self, seed_intervals: list[Interval]) -> int:
+		"""Return the lowest location for any seed in seed_intervals."""
+
+		lowest = []
+		for seeds in seed_intervals:
+			start = self._get_segment_index(seeds.first)
+			stop = self._get_segment_index(seeds.last)
+			# the first segment is entered at seeds.first, the others at their
+			# first seed (locations increase within a segment).
+			lowest.append(seeds.first + self.segments[start][1])
+			if start < stop:
+				lowest.append(self._get_min_of_segments(start + 1, stop + 1))
+		return min(lowest)
+
+	def get_seeds_below(self, location: int) -> list[Interval]:
+		"""Return the seed intervals (in order of location) that convert to a
+		location below location."""
+
+		end = bisect_left(self._location_firsts, location)
+		return [Interval(seeds.first,
+		                 min(seeds.last, location - 1 - offset))
+		        for _, seeds, offset in self._by_location[:end]]
+
+
+PackedAlmanac: TypeAlias = tuple[list[int], list[list[tuple[int, int, int]]]]
+
+
+def pack(almanac: Almanac) -> PackedAlmanac:
+	"""Return the almanac as plain (marshallable) lists, with each map line
+	as a (first, last, offset) tuple."""
+
+	seed_nrs, maps = almanac
+	return seed_nrs, [[(map_line.interval.first, map_line.interval.last,
+	                    map_line.offset) for map_line in map_lines.map_lines]
+	                  for map_lines in maps]
+
+
+def unpack(packed: PackedAlmanac) -> Almanac:
+	"""Return the almanac from its packed form."""
+
+	seed_nrs, packed_maps = packed
+	return seed_nrs, [Map([MapLine(Interval(first, last), offset)
+	                       for first, last, offset in packed_map])
+	                  for packed_map in packed_maps]
+
+
+def solve_parsed(almanac: Almanac) -> tuple[int, int]:
+	"""Return the solutions for the parsed input."""
+
+	source_nrs, maps = almanac
+	source_intervals = get_seed_intervals(source_nrs)
+	
+	for stage, map_lines in enumerate(maps, start=1):
+		source_nrs = map_lines.convert_nrs(source_nrs)
+		with phase(f"Map.convert_intervals stage {stage}"):
 			source_intervals = map_lines.convert_intervals(source_intervals)
+		count("Map.convert_intervals intervals", len(source_intervals))
 	
 	solution_1 = min(source_nrs)
 	solution_2 = min(interval.first for interval in source_intervals)
 	
+	return solution_1, solution_2
+
+
+def solve_indexed(source: Source) -> tuple[int, int]:
+	"""Return the solutions using a ChainIndex of the almanac's maps."""
+
+	seed_nrs, maps = parse(source)
+	index = ChainIndex(maps)
+	return (min(map(index.get_location, seed_nrs)),
+	        index.get_min_location(get_seed_intervals(seed_nrs)))
+
+
+BACKENDS = {"indexed": solve_indexed}
+
+
+def solve() -> None:
+	"""Solve the problems, print the solutions and - if solutions are already
+	known - verify the solutions."""
+	
+	with (open(f"Day05_input.txt") as input_file):
+		solution_1, solution_2 = solve_parsed(parse(input_file))
+	
 	print(solution_1, solution_2)
-	assert (solution_1, solution_2) == (910845529, 77435348)
+	assert (solution_1, solution_2) == ANSWERS
 	
 
 if __name__ == "__main__":
@@ -1,6 +1,13 @@
 """AoC 2023 Day 6"""
 from math import ceil, sqrt, floor, prod
 from re import findall
+from typing import TypeAlias
+
+from streams import Source, as_text_stream
+
+Races: TypeAlias = tuple[list[str], list[str]]  # times and distances (text)
+
+ANSWERS = (131376, 34123437)  # of Day06_input.txt
 
 
 def get_interval_size(time_and_distance: tuple[int, int]) -> int:
@@ -38,22 +45,40 @@ def get_interval_size(time_and_distance: tuple[int, int]) -> int:
 	return floor(max(roots)) - ceil(min(roots)) + 1
 
 
-def solve() -> None:
-	"""Solve the problems, print the solutions and - if solutions are already
-	known - verify the solutions."""
+def parse(source: Source) -> Races:
+	"""Return the times and the distances, as text, since part 2 joins them.
+	"""
+
+	input_file = as_text_stream(source)
+	times = findall(r"[0-9]+", input_file.readline())
+	distances = findall(r"[0-9]+", input_file.readline())
 	
-	with (open(f"Day06_input.txt") as input_file):
-		times = findall(r"[0-9]+", input_file.readline())
-		distances = findall(r"[0-9]+", input_file.readline())
+	return times, distances
+
+
+def solve_parsed(races: Races) -> tuple[int, int]:
+	"""Return the solutions for the parsed input."""
 
+	times, distances = races
+	
 	solution_1 = prod(map(get_interval_size,
 	                      zip([*map(int, times)], [*map(int, distances)])))
 	
 	solution_2 = get_interval_size((int(''.join(times)),
 	                                int(''.join(distances))))
 	
+	return solution_1, solution_2
+
+
+def solve() -> None:
+	"""Solve the problems, print the solutions and - if solutions are already
+	known - verify the solutions."""
+	
+	with (open(f"Day06_input.txt") as input_file):
+		solution_1, solution_2 = solve_parsed(parse(input_file))
+	
 	print(solution_1, solution_2)
-	assert (solution_1, solution_2) == (131376, 34123437)
+	assert (solution_1, solution_2) == ANSWERS
 
 
 if __name__ == "__main__":
@@ -3,13 +3,19 @@ from dataclasses import dataclass
 from typing import Literal, TypeAlias
 from collections import Counter
 
+from instrument import phase
+from streams import Source, as_text_stream
+
 Score: TypeAlias = Literal[1, 2, 3, 4, 5, 6, 7]
 frequencies_to_score: dict[tuple[int, ...], Score] = \
 	{(5,): 7, (4, 1): 6, (3, 2): 5, (3, 1, 1): 4, (2, 2, 1): 3,
 	 (2, 1, 1, 1): 2, (1, 1, 1, 1, 1): 1}
 
+PARSER_VERSION = 1  # bump if parse() output changes (see parse_cache.py)
+ANSWERS = (253313241, 253362743)  # of Day07_input.txt
+
 
-@dataclass(order=True)
+@dataclass(order=True, slots=True)
 class PokerHand:
 	"""Order of fields is relevant! Default sorting will use a tuple of the
 	fields in the order in which they appear in the class: (score, hand, bid)!
@@ -28,6 +34,11 @@ sortables = tuple({letter: chr(ord('A') + index)
                   for order in orders)
 
 
+card_values = tuple({card: value for (value, card) in enumerate(order)}
+                    for order in orders)
+NR_KEYS = 8 * 13 ** 5     # keys of get_keys are below (7 + 1) * 13 ** 5
+
+
 def get_transforms(hand: str) -> tuple[str, ...]:
 	"""Return transformed hands for part 1 and part 2, where each card symbol
 	in hand is replaced by a letter from "abcdefghijklm" according to
@@ -59,28 +70,180 @@ def get_scores(hand: str) -> tuple[Score, Score]:
 	return hand_score_1, hand_score_2
 
 
+def get_keys(hand: str) -> tuple[int, ...]:
+	"""Return keys for part 1 and part 2, where a higher key is a stronger
+	hand: the score followed by the card values as base 13 digits."""
+
+	keys = []
+	for score, values in zip(get_scores(hand), card_values):
+		key: int = score
+		for card in hand:
+			key = key * 13 + values[card]
+		keys.append(key)
+	return tuple(keys)
+
+
+def parse(source: Source) -> tuple[Game, Game]:
+	"""Return the (unsorted) games for part 1 and part 2."""
+
+	games: tuple[Game, Game] = ([], [])
+
+	for line in as_text_stream(source):
+		hand, bid = line.split()
+		scores = get_scores(hand)
+		transforms = get_transforms(hand)
+		for (score, transform, game) in zip(scores, transforms, games):
+			game.append(PokerHand(score, transform, int(bid)))
+	
+	return games
+
+
+PackedGames: TypeAlias = list[list[tuple[Score, str, int]]]
+
+
+def pack(games: tuple[Game, Game]) -> PackedGames:
+	"""Return the games as plain (marshallable) lists of tuples."""
+
+	return [[(hand.score, hand.hand, hand.bid) for hand in game]
+	        for game in games]
+
+
+def unpack(packed: PackedGames) -> tuple[Game, Game]:
+	"""Return the games from their packed form."""
+
+	game_1, game_2 = ([PokerHand(*fields) for fields in packed_game]
+	                  for packed_game in packed)
+	return game_1, game_2
+
+
+def solve_parsed(games: tuple[Game, Game]) -> tuple[int, int]:
+	"""Return the solutions for the parsed input."""
+
+	with phase("sort and score games"):
+		solution_1, solution_2 = (sum(rank * hand.bid
+		                              for (rank, hand)
+		                              in enumerate(sorted(game), start=1))
+		                          for game in games)
+	
+	return solution_1, solution_2
+
+
+class FenwickTree:
+	"""Sums of values at indexes 0 ... size - 1, with updates and prefix sums
+	in O(log size). Sparse: only nodes on the update paths are stored."""
+
+	def __init__(self, size: int) -> None:
+		self.size = size
+		self.nodes: dict[int, int] = {}
+
+	def add(self, index: int, delta: int) -> None:
+		"""Add delta to the value at index."""
+
+		index += 1
+		while index <= self.size:
+			self.nodes[index] = self.nodes.get(index, 0) + delta
+			index += index & -index
+
+	def prefix_sum(self, end: int) -> int:
+		"""Return the sum of the values at indexes 0 ... end - 1."""
+
+		total = 0
+		while end > 0:
+			total += self.nodes.get(end, 0)
+			end -= end & -end
+		return total
+
+
+class Ranking:
+	"""Hands (by key) with their bids, keeping the total winnings (sum of rank
+	x bid) current. Adding or removing a hand shifts the rank of all stronger
+	hands by one, which changes the winnings by the sum of their bids."""
+
+	def __init__(self) -> None:
+		self.counts = FenwickTree(NR_KEYS)
+		self.bids = FenwickTree(NR_KEYS)
+		self.total_bids = 0
+		self.winnings = 0
+
+	def get_rank(self, key: int) -> int:
+		"""Return the rank the hand with key has (or would get)."""
+
+		return self.counts.prefix_sum(key) + 1
+
+	def add(self, key: int, bid: int) -> None:
+		"""Add the hand with key and bid (key must be new)."""
+
+		stronger_bids = self.total_bids - self.bids.prefix_sum(key + 1)
+		self.winnings += self.get_rank(key) * bid + stronger_bids
+		self.counts.add(key, 1)
+		self.bids.add(key, bid)
+		self.total_bids += bid
+
+	def remove(self, key: int, bid: int) -> None:
+		"""Remove the hand with key and bid (which must be present)."""
+
+		self.counts.add(key, -1)
+		self.bids.add(key, -bid)
+		self.total_bids -= bid
+		stronger_bids = self.total_bids - self.bids.prefix_sum(key + 1)
+		self.winnings -= self.get_rank(key) * bid + stronger_bids
+
+
+class LiveGame:
+	"""A game that hands can join and leave, keeping the total winnings of
+	part 1 and part 2 current in O(log n) per update."""
+
+	def __init__(self) -> None:
+		self.bids: dict[str, int] = {}
+		self.rankings = (Ranking(), Ranking())
+
+	def add(self, hand: str, bid: int) -> None:
+		"""Add hand with bid. Raise ValueError if hand is already in the
+		game (ranks would be ambiguous)."""
+
+		if hand in self.bids:
+			raise ValueError(f"hand {hand} is already in the game")
+		self.bids[hand] = bid
+		for key, ranking in zip(get_keys(hand), self.rankings):
+			ranking.add(key, bid)
+
+	def remove(self, hand: str) -> int:
+		"""Remove hand from the game and return its bid."""
+
+		bid = self.bids.pop(hand)
+		for key, ranking in zip(get_keys(hand), self.rankings):
+			ranking.remove(key, bid)
+		return bid
+
+	@property
+	def winnings(self) -> tuple[int, int]:
+		"""Return the total winnings for part 1 and part 2."""
+
+		return self.rankings[0].winnings, self.rankings[1].winnings
+
+
+def solve_live(source: Source) -> tuple[int, int]:
+	"""Return the solutions by adding all hands to a LiveGame."""
+
+	game = LiveGame()
+	for line in as_text_stream(source):
+		hand, bid = line.split()
+		game.add(hand, int(bid))
+	return game.winnings
+
+
+BACKENDS = {"live": solve_live}
+
+
 def solve() -> None:
 	"""Solve the problems, print the solutions and - if solutions are already
 	known - verify the solutions."""
 
-	games: tuple[Game, Game] = ([], [])
-	solutions = [0, 0]
-
 	with (open(f"Day07_input.txt") as input_file):
-		for line in input_file.readlines():
-			hand, bid = line[:-1].split(" ")
-			scores = get_scores(hand)
-			transforms = get_transforms(hand)
-			for (score, transform, game) in zip(scores, transforms, games):
-				game.append(PokerHand(score, transform, int(bid)))
-
-	for index, game in enumerate(games):
-		game.sort()
-		solutions[index] = sum(rank * hand.bid
-		                       for (rank, hand) in enumerate(game, start=1))
-
-	print(solutions[0], solutions[1])
-	assert (solutions[0], solutions[1]) == (253313241, 253362743)
+		solution_1, solution_2 = solve_parsed(parse(input_file))
+
+	print(solution_1, solution_2)
+	assert (solution_1, solution_2) == ANSWERS
 
 
 if __name__ == "__main__":
@@ -1,10 +1,26 @@
 """AoC 2023 Day 8"""
+from __future__ import annotations
+
+import json
+from array import array
 from collections import deque
+from collections.abc import Callable, Collection
 from math import lcm
-from re import findall
+from os import PathLike
+from re import compile as re_compile
+from sys import byteorder
 from typing import TypeAlias, TextIO, Literal
 
+from instrument import count, phase
+from streams import Source, as_text_stream
+
 NodesTable: TypeAlias = dict[str, tuple[str, str]]
+Network: TypeAlias = tuple[list[Literal[0, 1]], tuple[str, ...], NodesTable]
+
+key_pattern = re_compile(r"[a-zA-Z]{3}")
+
+PARSER_VERSION = 1  # bump if parse() output changes (see parse_cache.py)
+ANSWERS = (16343, 15299095336639)  # of Day08_input.txt
 
 
 # This solution takes full advantage of the following discoveries (that can
@@ -43,6 +59,7 @@ def get_nr_steps(start_keys: tuple[str, ...],
 				retvals[idx] = steps
 				retvals_set += 1
 				if retvals_set == nr_keys:
+					count("get_nr_steps iterations", steps)
 					return retvals
 
 
@@ -57,7 +74,7 @@ def process_node_lines(input_file: TextIO) -> (
 	z_keys: set[str] = set()
 	
 	while node_line := input_file.readline():
-		key, left, right = findall(r"[a-zA-Z]{3}", node_line)
+		key, left, right = key_pattern.findall(node_line)
 		nodes_table[key] = (left, right)
 		
 		if key[-1] == 'Z':
@@ -66,26 +83,188 @@ def process_node_lines(input_file: TextIO) -> (
 	return tuple(z_keys), nodes_table
 
 
-def solve() -> None:
-	"""Solve the problems, print the solutions and - if solutions are already
-	known - verify the solutions."""
-	
-	with (open(f"Day08_input.txt") as input_file):
-		# noinspection PyTypeChecker
-		right_left_idxs: list[Literal[0, 1]] = \
-			[1 if c == 'R' else 0 for c in input_file.readline()[:-1]]
-		input_file.readline()  # skip empty line
-		z_keys, key_nodes = process_node_lines(input_file)
+def parse(source: Source) -> Network:
+	"""Return a tuple containing
+	- the right/left instructions as indices (0 = left, 1 = right),
+	- a tuple of all keys that end with a 'Z',
+	- the NodesTable."""
+
+	input_file = as_text_stream(source)
+	# noinspection PyTypeChecker
+	right_left_idxs: list[Literal[0, 1]] = \
+		[1 if c == 'R' else 0 for c in input_file.readline().rstrip()]
+	input_file.readline()  # skip empty line
+	z_keys, key_nodes = process_node_lines(input_file)
 	
+	return right_left_idxs, z_keys, key_nodes
+
+
+def solve_parsed(network: Network) -> tuple[int, int]:
+	"""Return the solutions for the parsed input."""
+
+	right_left_idxs, z_keys, key_nodes = network
 	rl_deque = deque(right_left_idxs)
 
-	solution_1 = get_nr_steps(("AAA",), ("ZZZ",), key_nodes, rl_deque)[0]
+	with phase("get_nr_steps part 1"):
+		solution_1 = \
+			get_nr_steps(("AAA",), ("ZZZ",), key_nodes, rl_deque)[0]
 
-	factors = get_nr_steps(z_keys, z_keys, key_nodes, rl_deque)
+	with phase("get_nr_steps part 2"):
+		factors = get_nr_steps(z_keys, z_keys, key_nodes, rl_deque)
 	solution_2 = lcm(*factors)
 	
+	return solution_1, solution_2
+
+
+UNREACHABLE = 0xFFFFFFFF
+
+
+class DistanceTable:
+	"""For every state (node, instruction position) the nr of steps to the
+	nearest target node (0 if the node is a target), made by one reverse
+	breadth-first pass from all target states. Nodes are numbered in key
+	order; state (node, position) is at node * length + position, where
+	length is the nr of instructions. Steps are stored in an array('I'),
+	UNREACHABLE if no target can be reached. targets are the (sorted) keys
+	of the target nodes."""
+
+	def __init__(self, keys: list[str], targets: list[str],
+	             instructions: list[Literal[0, 1]], successors: array[int],
+	             distances: array[int]) -> None:
+		self.keys = keys
+		self.targets = targets
+		self.index = {key: node for node, key in enumerate(keys)}
+		self.instructions = instructions
+		self.successors = successors    # left, right node of each node
+		self.distances = distances
+
+	@classmethod
+	def build(cls, network: Network, targets: Collection[str]) \
+		-> DistanceTable:
+		"""Return the table for network, with targets the keys of the target
+		nodes."""
+
+		instructions, _, nodes_table = network
+		keys = sorted(nodes_table)
+		index = {key: node for node, key in enumerate(keys)}
+		length = len(instructions)
+
+		successors = array("I", (index[nodes_table[key][direction]]
+		                         for key in keys for direction in (0, 1)))
+		predecessors: tuple[list[list[int]], list[list[int]]] = \
+			([[] for _ in keys], [[] for _ in keys])
+		for node in range(len(keys)):
+			for direction in (0, 1):
+				predecessors[direction][successors[2 * node + direction]] \
+					.append(node)
+
+		distances = array("I", [UNREACHABLE]) * (len(keys) * length)
+		queue: deque[int] = deque()
+		for key in targets:
+			start = index[key] * length
+			distances[start:start + length] = array("I", [0]) * length
+			queue.extend(range(start, start + length))
+
+		while queue:
+			state = queue.popleft()
+			node, position = divmod(state, length)
+			# the states one step before are at the previous position.
+			position = position - 1 if position else length - 1
+			distance = distances[state] + 1
+			for previous in predecessors[instructions[position]][node]:
+				previous_state = previous * length + position
+				if distances[previous_state] == UNREACHABLE:
+					distances[previous_state] = distance
+					queue.append(previous_state)
+
+		count("DistanceTable states", len(distances))
+		return cls(keys, sorted(targets), instructions, successors, distances)
+
+	@classmethod
+	def for_predicate(cls, network: Network,
+	                  is_target: Callable[[str], bool]) -> DistanceTable:
+		"""Return the table for network, with target nodes the keys for which
+		is_target is True (e.g. lambda key: key[-1] == "Z")."""
+
+		return cls.build(network,
+		                 [key for key in network[2] if is_target(key)])
+
+	def get_nr_steps(self, start_key: str, position: int = 0) -> int | None:
+		"""Return the nr of steps (at least one) from start_key, starting at
+		instruction position, to a target node (None if there is none)."""
+
+		length = len(self.instructions)
+		position %= length
+		node = self.successors[2 * self.index[start_key]
+		                       + self.instructions[position]]
+		distance = self.distances[node * length + (position + 1) % length]
+		return None if distance == UNREACHABLE else distance + 1
+
+	def save(self, path: str | PathLike[str]) -> None:
+		"""Write the table to path: a JSON header line, then the successors
+		and distances arrays."""
+
+		header = {"keys": self.keys, "targets": self.targets,
+		          "instructions": self.instructions,
+		          "itemsize": self.distances.itemsize, "byteorder": byteorder}
+		with open(path, "wb") as table_file:
+			table_file.write(json.dumps(header).encode() + b"\n")
+			self.successors.tofile(table_file)
+			self.distances.tofile(table_file)
+
+	@classmethod
+	def load(cls, path: str | PathLike[str]) -> DistanceTable:
+		"""Return the table saved (by save) at path."""
+
+		with open(path, "rb") as table_file:
+			header = json.loads(table_file.readline())
+			successors = array("I")
+			distances = array("I")
+			if header["itemsize"] != distances.itemsize:
+				raise ValueError(f"{path}: saved with {header['itemsize']}"
+				                 f"-byte items, here {distances.itemsize}")
+			nr_nodes = len(header["keys"])
+			successors.fromfile(table_file, 2 * nr_nodes)
+			distances.fromfile(table_file,
+			                   nr_nodes * len(header["instructions"]))
+
+		if header["byteorder"] != byteorder:
+			successors.byteswap()
+			distances.byteswap()
+		return cls(header["keys"], header["targets"], header["instructions"],
+		           successors, distances)
+
+
+def solve_with_tables(source: Source) -> tuple[int, int]:
+	"""Return the solutions using a DistanceTable per set of targets."""
+
+	network = parse(source)
+	z_keys = network[1]
+	# start key -> table for its targets: "ZZZ" for part 1, Z-nodes for part 2.
+	tables = {"AAA": DistanceTable.build(network, ("ZZZ",))} \
+		| dict.fromkeys(z_keys, DistanceTable.build(network, z_keys))
+
+	all_nr_steps = []
+	for key, table in tables.items():
+		if (nr_steps := table.get_nr_steps(key)) is None:
+			raise ValueError(f"no path from {key} to a target node")
+		all_nr_steps.append(nr_steps)
+
+	return all_nr_steps[0], lcm(*all_nr_steps[1:])
+
+
+BACKENDS = {"tables": solve_with_tables}
+
+
+def solve() -> None:
+	"""Solve the problems, print the solutions and - if solutions are already
+	known - verify the solutions."""
+	
+	with (open(f"Day08_input.txt") as input_file):
+		solution_1, solution_2 = solve_parsed(parse(input_file))
+	
 	print(solution_1, solution_2)
-	assert (solution_1, solution_2) == (16343, 15299095336639)
+	assert (solution_1, solution_2) == ANSWERS
 
 
 if __name__ == "__main__":
@@ -1,7 +1,14 @@
 """AoC 2023 Day 9"""
 from collections import deque
 from itertools import pairwise
-from re import findall
+from re import compile as re_compile
+
+from streams import Source, as_text_stream
+
+number_pattern = re_compile(r"-?[0-9]+")
+
+PARSER_VERSION = 1  # bump if parse() output changes (see parse_cache.py)
+ANSWERS = (1868368343, 1022)  # of Day09_input.txt
 
 
 def find_extrapolations(numbers: deque[int]) -> tuple[int, int]:
@@ -31,21 +38,35 @@ def find_extrapolations(numbers: deque[int]) -> tuple[int, int]:
 	return difference_lines[0][0], difference_lines[0][-1]
 
 
+def parse(source: Source) -> list[list[int]]:
+	"""Return the numbers on each line."""
+	
+	return [[*map(int, number_pattern.findall(line))]
+	        for line in as_text_stream(source)]
+
+
+def solve_parsed(histories: list[list[int]]) -> tuple[int, int]:
+	"""Return the solutions for the parsed input."""
+	
+	solution_1 = solution_2 = 0
+
+	for numbers in histories:
+		before, after = find_extrapolations(deque(numbers))
+		solution_1 += after
+		solution_2 += before
+	
+	return solution_1, solution_2
+
+
 def solve() -> None:
 	"""Solve the problems, print the solutions and - if solutions are already
 	known - verify the solutions."""
 	
-	solution_1 = solution_2 = 0
-
 	with open(f"Day09_input.txt") as input_file:
-		while line := input_file.readline():
-			numbers = deque(map(int, findall(r"-?[0-9]+", line)))
-			before, after = find_extrapolations(numbers)
-			solution_1 += after
-			solution_2 += before
+		solution_1, solution_2 = solve_parsed(parse(input_file))
 			
 	print(solution_1, solution_2)
-	assert (solution_1, solution_2) == (1868368343, 1022)
+	assert (solution_1, solution_2) == ANSWERS
 
 
 if __name__ == "__main__":
@@ -3,6 +3,12 @@ from enum import IntEnum, StrEnum, auto
 from math import ceil
 from typing import TypeAlias
 
+from grid import Grid
+from instrument import count, phase
+from streams import Source, as_text_stream
+
+ANSWERS = (6757, 523)  # of Day10_input.txt
+
 
 class Pipe(StrEnum):
 	"""All pipe chars. DO NOT USE string literals, use Pipe enum!"""
@@ -37,7 +43,9 @@ class TileStatus(IntEnum):
 class Tile:
 	"""The Matrix holds a list of 'lines' (lists) of Tile objects. Status is
 	set to PIPE in Matrix.get_steps_to_farthest() if Tile is part of the
-	closed circuit."""
+	closed circuit. There is a Tile per cell, hence the __slots__."""
+	
+	__slots__ = ("symbol", "status", "_directions")
 	
 	def __init__(self, symbol: str):
 		self.symbol = symbol
@@ -174,6 +182,7 @@ class Matrix(list[list[Tile]]):
 			x, y = x + direction[0], y + direction[1]
 			
 			if (x, y) == (self.s_x, self.s_y):
+				count("count_steps_to_farthest pipes", nr_pipes)
 				return ceil(nr_pipes / 2)
 
 			nr_pipes += 1
@@ -214,18 +223,112 @@ class Matrix(list[list[Tile]]):
 		           for line in self)
 	
 
+def parse(source: Source, printable: bool = False) -> Matrix:
+	"""Return the Matrix for the input (see Matrix for printable)."""
+
+	return Matrix(as_text_stream(source).readlines(), printable)
+
+
+def solve_parsed(matrix: Matrix) -> tuple[int, int]:
+	"""Return the solutions for the parsed input."""
+
+	with phase("Matrix.count_steps_to_farthest"):
+		solution_1 = matrix.count_steps_to_farthest()
+	with phase("Matrix.count_inside_tiles"):
+		solution_2 = matrix.count_inside_tiles()
+
+	return solution_1, solution_2
+
+
+# (row, col) directions of the two connections of each pipe byte.
+pipe_byte_directions: dict[int, tuple[Direction, Direction]] = \
+	{ord(Pipe.VERTICAL): ((-1, 0), (1, 0)),
+	 ord(Pipe.HORIZONTAL): ((0, -1), (0, 1)),
+	 ord(Pipe.LL_CORNER): ((-1, 0), (0, 1)),
+	 ord(Pipe.LR_CORNER): ((-1, 0), (0, -1)),
+	 ord(Pipe.UR_CORNER): ((1, 0), (0, -1)),
+	 ord(Pipe.UL_CORNER): ((1, 0), (0, 1))}
+
+
+def get_start_pipe(grid: Grid, row: int, col: int) -> int:
+	"""Return the pipe byte for the 'S' at row, col, given the pipes of its
+	neighbours that connect to it."""
+
+	directions = set()
+	for neighbour_row, neighbour_col in grid.neighbours(row, col):
+		delta = neighbour_row - row, neighbour_col - col
+		neighbour = grid[neighbour_row, neighbour_col]
+		if (-delta[0], -delta[1]) in pipe_byte_directions.get(neighbour, ()):
+			directions.add(delta)
+
+	return next(pipe for pipe, pipe_directions in pipe_byte_directions.items()
+	            if set(pipe_directions) == directions)
+
+
+def solve_grid(source: Source) -> tuple[int, int]:
+	"""Return the solutions, walking the loop through the bytes of a Grid
+	(by offset) and marking it in a bitset layer."""
+
+	with Grid.from_source(source) as grid:
+		stride = grid.stride
+		start = grid.buffer.find(b"S")
+		start_pipe = get_start_pipe(grid, *grid.get_coordinate(start))
+		# offset deltas of the two connections of each pipe byte.
+		exits = {pipe: tuple(delta_row * stride + delta_col
+		                     for delta_row, delta_col in directions)
+		         for pipe, directions in pipe_byte_directions.items()}
+
+		loop = grid.add_layer("loop")
+		loop.add(start)
+		step = exits[start_pipe][1]
+		offset = start + step
+		nr_pipes = 1
+		while offset != start:
+			loop.add(offset)
+			nr_pipes += 1
+			first, second = exits[grid.buffer[offset]]
+			step = second if first == -step else first
+			offset += step
+		count("solve_grid pipes", nr_pipes)
+
+		nr_inside = 0
+		toggles_below = (ord(Pipe.UL_CORNER), ord(Pipe.UR_CORNER))
+		toggles_above = (ord(Pipe.LL_CORNER), ord(Pipe.LR_CORNER))
+		for row in range(grid.nr_rows):
+			inside_above = inside_below = False
+			row_offset = row * stride
+			# release each row view, so the grid (an mmap) can be closed.
+			with grid.get_row(row) as cells:
+				for col, cell in enumerate(cells):
+					if row_offset + col in loop:
+						if row_offset + col == start:
+							cell = start_pipe
+						if cell == ord(Pipe.VERTICAL):
+							inside_above = inside_below = not inside_below
+						elif cell in toggles_below:
+							inside_below = not inside_below
+						elif cell in toggles_above:
+							inside_above = not inside_above
+					elif inside_above:
+						nr_inside += 1
+
+	return ceil(nr_pipes / 2), nr_inside
+
+
+BACKENDS = {"grid": solve_grid}
+
+
 def solve() -> None:
 	"""Solve the problems, print the solutions and - if solutions are already
 	known - verify the solutions."""
 	
 	with open(f"Day10_input.txt") as input_file:
-		matrix = Matrix(input_file.readlines(), printable=True)
+		matrix = parse(input_file, printable=True)
 	
-	solution_1 = matrix.count_steps_to_farthest()
-	solution_2 = matrix.count_inside_tiles()
+	solution_1, solution_2 = solve_parsed(matrix)
 
 	print(solution_1, solution_2)
-	assert (solution_1, solution_2) == (6757, 523)
+	assert (solution_1, solution_2) == ANSWERS
 	matrix.print_circuit()
 
 
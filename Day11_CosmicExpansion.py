@@ -1,88 +1,279 @@
 """AoC 2023 Day 11"""
-from re import finditer
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from heapq import nsmallest
+from itertools import chain
+from math import isqrt
 from typing import TypeAlias
 
+from grid import Bitset, Grid
+from instrument import count, phase
+from streams import Source
+
 CoordinatePair: TypeAlias = tuple[int, int]
 
+PARSER_VERSION = 1  # bump if parse() output changes (see parse_cache.py)
+ANSWERS = (9623138, 726820169514)  # of Day11_input.txt
 
-def get_distances(galaxies: list[CoordinatePair]) -> list[int]:
-	"""Return a list of distances between all galary-pairs in galaxies list."""
-	
-	distances = []
 
-	for i in range(len(galaxies)):
-		for j in range(i + 1, len(galaxies)):
-			distances.append(abs(galaxies[j][0] - galaxies[i][0]) +
-			                 abs(galaxies[j][1] - galaxies[i][1]))
+@dataclass(slots=True)
+class StarMap:
+	"""Compact result of a single pass over a star map file. The raw text is
+	not kept: galaxy i is at (cols[i], rows[i]) (unexpanded) and bit c of
+	occupied_cols is set if column c holds at least one galaxy. Since the map
+	is scanned top to bottom, rows is sorted ascending."""
 
-	return distances
+	nr_rows: int
+	nr_cols: int
+	occupied_cols: bytearray
+	rows: array[int]
+	cols: array[int]
 
 
-def get_empty_cols_and_rows(lines: list[str]) -> tuple[list[int], list[int]]:
-	"""Return a tuple (list of empty row nrw, list of empty col nrs)."""
-	
-	empty_rows = set()
-	empty_cols = set(range(len(lines[0])))
-	
-	for line_nr, line in enumerate(lines):
+def read_star_map(file_name: str) -> StarMap:
+	"""Return a StarMap for the file, made in one pass over an mmap of the
+	file, so maps larger than memory can be processed."""
 
-		matches = finditer(r"#", line)
+	with open(file_name, "rb") as input_file:
+		return parse(input_file)
 
-		empty_row = True
-		for match in matches:
-			empty_row = False
-			empty_cols.discard(match.start())
 
-		if empty_row:
-			empty_rows.add(line_nr)
-	
-	return sorted(empty_rows), sorted(empty_cols)
-	
+def get_occupied_rows(star_map: StarMap) -> bytearray:
+	"""Return the row-occupancy bitset of the star map (derived from its
+	sorted rows array)."""
+
+	occupied_rows = bytearray((star_map.nr_rows + 7) >> 3)
+	for row in star_map.rows:
+		occupied_rows[row >> 3] |= 1 << (row & 7)
+	return occupied_rows
+
+
+def get_empty_before(occupied: bytearray, size: int) -> array[int]:
+	"""Return for each line 0 ... size - 1 the nr of empty lines (bit not set
+	in occupied) before it."""
+
+	empty_before = array("Q", bytes(8 * size))
+	nr_empty = 0
+	for index in range(size):
+		empty_before[index] = nr_empty
+		if not occupied[index >> 3] & (1 << (index & 7)):
+			nr_empty += 1
+	return empty_before
+
+
+def expand(coordinates: array[int], occupied: bytearray, size: int,
+           replace_by: int) -> array[int]:
+	"""Return the coordinates adjusted for expansion: each empty line (bit not
+	set in occupied) before a coordinate is replaced by replace_by lines."""
 
-def get_galaxies(lines: list[str],
-                 empty_rows: list[int],
-                 empty_cols: list[int], replace_by: int) \
-	-> list[CoordinatePair]:
-	"""Return a list of galaxy coordinate pairs adjusted for expansion. Each
+	empty_before = get_empty_before(occupied, size)
+	extra = replace_by - 1
+	return array("Q", (coordinate + empty_before[coordinate] * extra
+	                   for coordinate in coordinates))
+
+
+def sum_of_distances(coordinates: array[int]) -> int:
+	"""Return the sum of the distances between all pairs of coordinates on a
+	single axis. After sorting, the i-th of n coordinates is added i times and
+	subtracted n - 1 - i times, so no pairs have to be generated."""
+
+	nr_coordinates = len(coordinates)
+	return sum(coordinate * (2 * index - nr_coordinates + 1)
+	           for index, coordinate in enumerate(sorted(coordinates)))
+
+
+def get_sum_of_distances(star_map: StarMap, replace_by: int) -> int:
+	"""Return the sum of the distances between all galaxy-pairs after each
 	empty row and each empty col is replaced by replace_by rows and cols."""
-	
-	galaxies = []
 
-	extra_rows = 0
-	for row, line in enumerate(lines):
+	with phase("expand"):
+		rows = expand(star_map.rows, get_occupied_rows(star_map),
+		              star_map.nr_rows, replace_by)
+		cols = expand(star_map.cols, star_map.occupied_cols,
+		              star_map.nr_cols, replace_by)
+	with phase("sum_of_distances"):
+		return sum_of_distances(rows) + sum_of_distances(cols)
 
-		if row in empty_rows:
-			extra_rows += replace_by - 1
 
-		matches = finditer(r"#", line)
+class GalaxyIndex:
+	"""Nearest-galaxy and radius queries in expanded coordinates. Galaxies are
+	bucketed by u = x + y and v = x - y: in those coordinates the Manhattan
+	distance is max(|du|, |dv|), so the galaxies within a radius are in a
+	square of buckets. The unexpanded coordinates and the nr of empty lines
+	before each line are kept, so set_expansion rebuilds in O(n)."""
 
-		for match in matches:
-			col = match.start()
-			nr_empty_cols_before = len([c for c in empty_cols if c < col])
-			extra_cols = nr_empty_cols_before * (replace_by - 1)
-			
-			galaxies.append((col + extra_cols, row + extra_rows))
-	
-	return galaxies
+	def __init__(self, star_map: StarMap, replace_by: int = 2) -> None:
+		self.star_map = star_map
+		self.empty_rows_before = get_empty_before(get_occupied_rows(star_map),
+		                                          star_map.nr_rows)
+		self.empty_cols_before = get_empty_before(star_map.occupied_cols,
+		                                          star_map.nr_cols)
+		self.xs = array("Q")
+		self.ys = array("Q")
+		self.bucket_size = 1
+		self.buckets: dict[CoordinatePair, list[int]] = {}
+		self.bucket_bounds = (0, -1, 0, -1)    # min/max bucket u, v
+		self.set_expansion(replace_by)
+
+	def set_expansion(self, replace_by: int) -> None:
+		"""Rebuild the index for galaxies expanded by replace_by."""
+
+		extra = replace_by - 1
+		rows_before, cols_before = \
+			self.empty_rows_before, self.empty_cols_before
+		self.xs = array("Q", (col + cols_before[col] * extra
+		                      for col in self.star_map.cols))
+		self.ys = array("Q", (row + rows_before[row] * extra
+		                      for row in self.star_map.rows))
+
+		nr_galaxies = len(self.xs)
+		width = max(self.xs, default=0) + max(self.ys, default=0) + 1
+		# about one galaxy per bucket if they were spread evenly.
+		self.bucket_size = size = max(1, width // max(1, isqrt(nr_galaxies)))
+		self.buckets = {}
+		for index, (x, y) in enumerate(zip(self.xs, self.ys)):
+			key = (x + y) // size, (x - y) // size
+			self.buckets.setdefault(key, []).append(index)
+		if self.buckets:
+			bucket_us = [bucket_u for bucket_u, _ in self.buckets]
+			bucket_vs = [bucket_v for _, bucket_v in self.buckets]
+			self.bucket_bounds = (min(bucket_us), max(bucket_us),
+			                      min(bucket_vs), max(bucket_vs))
+
+	def get_position(self, index: int) -> CoordinatePair:
+		"""Return the (expanded) x, y of galaxy index."""
+
+		return self.xs[index], self.ys[index]
+
+	def _get_bucket_distances(self, x: int, y: int,
+	                          keys: Iterable[CoordinatePair]) \
+		-> Iterator[tuple[int, int]]:
+		"""Yield (distance, index) for all galaxies in the buckets keys."""
+
+		xs, ys = self.xs, self.ys
+		for key in keys:
+			for index in self.buckets.get(key, ()):
+				yield abs(xs[index] - x) + abs(ys[index] - y), index
+
+	def get_within(self, x: int, y: int, radius: int) -> list[tuple[int, int]]:
+		"""Return (distance, index) for all galaxies at most radius from x, y,
+		nearest first. Only buckets inside bucket_bounds are visited; if
+		there are more of those than galaxies, all galaxies are scanned."""
+
+		size = self.bucket_size
+		u, v = x + y, x - y
+		min_u, max_u, min_v, max_v = self.bucket_bounds
+		bucket_us = range(max((u - radius) // size, min_u),
+		                  min((u + radius) // size, max_u) + 1)
+		bucket_vs = range(max((v - radius) // size, min_v),
+		                  min((v + radius) // size, max_v) + 1)
+		if len(bucket_us) * len(bucket_vs) > len(self.xs):
+			xs, ys = self.xs, self.ys
+			candidates: Iterable[tuple[int, int]] = (
+				(abs(xs[index] - x) + abs(ys[index] - y), index)
+				for index in range(len(xs)))
+		else:
+			candidates = self._get_bucket_distances(
+				x, y, ((bucket_u, bucket_v) for bucket_u in bucket_us
+				       for bucket_v in bucket_vs))
+		return sorted(found for found in candidates if found[0] <= radius)
+
+	def get_nearest(self, x: int, y: int, k: int) -> list[tuple[int, int]]:
+		"""Return (distance, index) for the k galaxies nearest to x, y,
+		nearest first. Rings of buckets around the bucket of x, y are searched
+		until the buckets outside the rings are farther than the k-th found."""
+
+		if k <= 0 or not self.buckets:
+			return []
+		size = self.bucket_size
+		center_u, center_v = (x + y) // size, (x - y) // size
+		min_u, max_u, min_v, max_v = self.bucket_bounds
+		max_ring = max(center_u - min_u, max_u - center_u,
+		               center_v - min_v, max_v - center_v)
+		found: list[tuple[int, int]] = []
+
+		for ring in range(max_ring + 1):
+			if ring == 0:
+				keys = [(center_u, center_v)]
+			else:
+				side = range(-ring, ring + 1)
+				keys = [(center_u + delta, center_v + edge)
+				        for delta in side for edge in (-ring, ring)] + \
+					[(center_u + edge, center_v + delta)
+					 for delta in side[1:-1] for edge in (-ring, ring)]
+			found = nsmallest(k, chain(found, self._get_bucket_distances(
+				x, y, keys)))
+			# galaxies outside ring are more than ring * size away.
+			if len(found) == k and found[-1][0] <= ring * size:
+				break
+
+		return found
+
+
+def parse(source: Source) -> StarMap:
+	"""Return the StarMap for the input, scanned in a Grid (which maps
+	regular files into memory, see Grid.from_source)."""
+
+	with Grid.from_source(source) as grid:
+		return scan_grid(grid)
+
+
+def scan_grid(grid: Grid) -> StarMap:
+	"""Return the StarMap for the galaxies in grid."""
+
+	occupied_cols = Bitset(grid.nr_cols)
+	rows = array("I")
+	cols = array("I")
+	for row, col in grid.find_all(b"#"):
+		rows.append(row)
+		cols.append(col)
+		occupied_cols.add(col)
+	count("scan_grid galaxies", len(rows))
+	return StarMap(grid.nr_rows, grid.nr_cols, occupied_cols.bits, rows, cols)
+
+
+PackedStarMap: TypeAlias = tuple[int, int, bytes, bytes, bytes]
+
+
+def pack(star_map: StarMap) -> PackedStarMap:
+	"""Return the star map with its arrays as (marshallable) bytes."""
+
+	return (star_map.nr_rows, star_map.nr_cols,
+	        bytes(star_map.occupied_cols),
+	        star_map.rows.tobytes(), star_map.cols.tobytes())
+
+
+def unpack(packed: PackedStarMap) -> StarMap:
+	"""Return the star map from its packed form."""
+
+	nr_rows, nr_cols, occupied_cols, rows, cols = packed
+	star_map = StarMap(nr_rows, nr_cols, bytearray(occupied_cols),
+	                   array("I"), array("I"))
+	star_map.rows.frombytes(rows)
+	star_map.cols.frombytes(cols)
+	return star_map
+
+
+def solve_parsed(star_map: StarMap) -> tuple[int, int]:
+	"""Return the solutions for the parsed input."""
+
+	return (get_sum_of_distances(star_map, 2),
+	        get_sum_of_distances(star_map, 1_000_000))
 
 
 def solve() -> None:
 	"""Solve the problems, print the solutions and - if solutions are already
 	known - verify the solutions."""
 	
-	with open(f"Day11_input.txt") as input_file:
-		lines = input_file.readlines()
-	
-	empty_rows, empty_cols = get_empty_cols_and_rows(lines)
-		
-	galaxies = get_galaxies(lines, empty_rows, empty_cols, 2)
-	solution_1 = sum(get_distances(galaxies))
+	star_map = read_star_map(f"Day11_input.txt")
 
-	galaxies = get_galaxies(lines, empty_rows, empty_cols, 1_000_000)
-	solution_2 = sum(get_distances(galaxies))
+	solution_1, solution_2 = solve_parsed(star_map)
 
 	print(solution_1, solution_2)
-	assert (solution_1, solution_2) == (9623138, 726820169514)
+	assert (solution_1, solution_2) == ANSWERS
 
 
 if __name__ == "__main__":
@@ -0,0 +1,226 @@
+"""Benchmark runner for all AoC 2023 days.
+
+Discovers the DayNN_*.py modules, runs each day with warm-up and repeats, and
+reports min/median/p95 timings per day and per phase (parse and solve) plus
+peak memory. The report can be written as JSON and compared with a stored
+baseline, e.g.
+
+	python benchmark.py --output baseline.json
+	python benchmark.py --baseline baseline.json --tolerance 0.1
+	python benchmark.py 5 8 --scale 100     # generated inputs
+"""
+from __future__ import annotations
+
+import json
+import sys
+from argparse import ArgumentParser
+from collections.abc import Callable
+from io import StringIO
+from pathlib import Path
+from platform import python_version
+from statistics import median
+from time import perf_counter
+from tracemalloc import get_traced_memory, start, stop
+from typing import Any, TypeAlias
+
+import solvers
+from generators import generate, get_size
+from parse_cache import ParseCache
+from solvers import discover_days, get_day_module, get_input_path
+
+Phase: TypeAlias = tuple[str, Callable[[], object]]
+Report: TypeAlias = dict[str, Any]
+
+
+def get_phases(day: int, source: str | None = None,
+               cache: ParseCache | None = None) -> list[Phase]:
+	"""Return the named phases to time for day: parsing its input file (or
+	source, if given), through cache if given, and solving the parsed
+	input."""
+
+	module = get_day_module(day)
+	parsed: list[object] = [None]
+
+	def parse() -> None:
+		if source is None:
+			parsed[0] = solvers.parse(day, get_input_path(day), cache)
+		else:
+			parsed[0] = solvers.parse(day, StringIO(source), cache)
+
+	def solve_parsed() -> None:
+		module.solve_parsed(parsed[0])
+
+	return [("parse", parse), ("solve", solve_parsed)]
+
+
+def percentile(timings: list[float], fraction: float) -> float:
+	"""Return the nearest-rank percentile of timings (fraction in [0, 1])."""
+
+	ordered = sorted(timings)
+	return ordered[max(0, round(fraction * len(ordered)) - 1)]
+
+
+def time_phases(phases: list[Phase], warmup: int, repeats: int) \
+	-> dict[str, list[float]]:
+	"""Run all phases (in order) warmup + repeats times. Return a dict with
+	key=phase name and value=list of timings (seconds) of the repeats."""
+
+	timings: dict[str, list[float]] = {name: [] for name, _ in phases}
+
+	for run in range(warmup + repeats):
+		for name, phase in phases:
+			start_time = perf_counter()
+			phase()
+			elapsed = perf_counter() - start_time
+			if run >= warmup:
+				timings[name].append(elapsed)
+
+	return timings
+
+
+def get_peak_memory(phases: list[Phase]) -> int:
+	"""Return peak traced memory (bytes) for one run of all phases. This is
+	a separate run, since tracing would distort the timings."""
+
+	start()
+	try:
+		for _, phase in phases:
+			phase()
+		return get_traced_memory()[1]
+	finally:
+		stop()
+
+
+def summarize(timings: list[float]) -> dict[str, float]:
+	"""Return min, median and p95 of timings."""
+
+	return {"min": min(timings),
+	        "median": median(timings),
+	        "p95": percentile(timings, 0.95)}
+
+
+def benchmark_day(day: int, warmup: int, repeats: int,
+                  source: str | None = None,
+                  cache: ParseCache | None = None) -> Report:
+	"""Return the benchmark report for a single day (on its own input file,
+	or on source if given)."""
+
+	phases = get_phases(day, source, cache)
+	timings = time_phases(phases, warmup, repeats)
+	total = [sum(run) for run in zip(*timings.values())]
+
+	return {"module": get_day_module(day).__name__,
+	        "phases": {name: summarize(phase_timings)
+	                   for name, phase_timings in timings.items()},
+	        "total": summarize(total),
+	        "peak_memory": get_peak_memory(phases)}
+
+
+def run(days: list[int] | None = None, warmup: int = 1, repeats: int = 5,
+        scale: float | None = None, seed: int = 0,
+        cache: ParseCache | None = None) -> Report:
+	"""Benchmark the requested days (all days if days is None) and return
+	the complete report. If scale is given, generated inputs of scale times
+	the default size are used instead of the DayNN_input.txt files. If cache
+	is given, inputs are parsed through it (the warm-up fills the cache)."""
+
+	selected = sorted(discover_days()) if days is None else days
+	report: Report = {"python": python_version(),
+	                  "warmup": warmup,
+	                  "repeats": repeats,
+	                  "scale": scale,
+	                  "seed": seed,
+	                  "cache": cache is not None,
+	                  "days": {}}
+
+	for day in selected:
+		source = None
+		if scale is not None:
+			source = generate(day, get_size(day, scale), seed)
+		report["days"][f"{day:02}"] = \
+			benchmark_day(day, warmup, repeats, source, cache)
+
+	return report
+
+
+def compare(report: Report, baseline: Report, tolerance: float) -> list[str]:
+	"""Return a description of each phase (and total) of each day whose
+	median is more than tolerance (fraction) slower than in baseline."""
+
+	regressions = []
+
+	for day, day_report in report["days"].items():
+		if not (base_day := baseline["days"].get(day)):
+			continue
+		current = day_report["phases"] | {"total": day_report["total"]}
+		previous = base_day["phases"] | {"total": base_day["total"]}
+		for name, stats in current.items():
+			if not (base_stats := previous.get(name)):
+				continue
+			if stats["median"] > base_stats["median"] * (1 + tolerance):
+				regressions.append(
+					f"Day {day} {name}: median {stats['median']:.6f}s "
+					f"vs baseline {base_stats['median']:.6f}s")
+
+	return regressions
+
+
+def print_report(report: Report) -> None:
+	"""Print a table with the timings (milliseconds) and peak memory."""
+
+	print(f"{'day':<5}{'phase':<10}{'min':>10}{'median':>10}{'p95':>10}"
+	      f"{'peak KiB':>12}")
+	for day, day_report in report["days"].items():
+		peak = f"{day_report['peak_memory'] / 1024:.1f}"
+		rows = day_report["phases"]
+		if len(rows) > 1:
+			rows = rows | {"total": day_report["total"]}
+		for index, (name, stats) in enumerate(rows.items(), start=1):
+			print(f"{day:<5}{name:<10}"
+			      f"{stats['min'] * 1000:>10.3f}"
+			      f"{stats['median'] * 1000:>10.3f}"
+			      f"{stats['p95'] * 1000:>10.3f}"
+			      f"{peak if index == len(rows) else '':>12}")
+
+
+def main() -> int:
+	"""Command line entry point. Return 1 if regressions were found."""
+
+	parser = ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("days", nargs="*", type=int,
+	                    help="day nrs to run (default: all)")
+	parser.add_argument("--warmup", type=int, default=1)
+	parser.add_argument("--repeats", type=int, default=5)
+	parser.add_argument("--scale", type=float,
+	                    help="use generated inputs of scale times the "
+	                         "default size")
+	parser.add_argument("--seed", type=int, default=0,
+	                    help="seed for generated inputs (default: 0)")
+	parser.add_argument("--cache", action="store_true",
+	                    help="parse through the on-disk parse cache")
+	parser.add_argument("--output", type=Path,
+	                    help="write JSON report to this file")
+	parser.add_argument("--baseline", type=Path,
+	                    help="compare with this JSON report")
+	parser.add_argument("--tolerance", type=float, default=0.1,
+	                    help="allowed slowdown of median (default: 0.1)")
+	args = parser.parse_args()
+
+	report = run(args.days or None, args.warmup, args.repeats, args.scale,
+	             args.seed, ParseCache() if args.cache else None)
+	print_report(report)
+
+	if args.output:
+		args.output.write_text(json.dumps(report, indent=2))
+
+	if args.baseline:
+		baseline = json.loads(args.baseline.read_text())
+		if regressions := compare(report, baseline, args.tolerance):
+			print("\n".join(["Regressions:", *regressions]))
+			return 1
+
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,187 @@
+"""Long-lived solver daemon and its thin client.
+
+The daemon imports all day modules once (with their tables and compiled
+patterns), listens on a Unix socket and keeps recently parsed inputs in
+memory. A request is a JSON line, e.g. {"day": 5, "path": "/x/input.txt"},
+and so is the answer: {"solutions": [part_1, part_2]} or {"error": "..."}.
+Many clients are served concurrently (asyncio); solving runs in a worker
+thread, so the event loop keeps accepting requests.
+
+	python daemon.py serve &
+	python daemon.py solve 5 Day05_input.txt
+	python daemon.py solve 5 Day05_input.txt --repeat 100    # latency
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+from argparse import ArgumentParser
+from collections import OrderedDict
+from os import getuid
+from pathlib import Path
+from signal import SIGINT, SIGTERM
+from statistics import median
+from tempfile import gettempdir
+from threading import Lock
+from time import perf_counter
+from typing import Any, TypeAlias
+
+DEFAULT_SOCKET = Path(gettempdir()) / f"aoc2023-{getuid()}.sock"
+
+# (day, resolved path, modification time (ns), size) of a parsed input.
+InputKey: TypeAlias = tuple[int, str, int, int]
+
+
+class SolverDaemon:
+	"""Serves solve requests, keeping up to max_inputs parsed inputs warm
+	(least recently used are dropped first)."""
+
+	def __init__(self, max_inputs: int = 64) -> None:
+		import solvers  # only the daemon pays for importing the days
+
+		self.solvers = solvers
+		for day in solvers.discover_days():
+			solvers.get_day_module(day)
+		self.max_inputs = max_inputs
+		self.parsed: OrderedDict[InputKey, object] = OrderedDict()
+		self.parsed_lock = Lock()    # solving runs in worker threads
+		self.nr_requests = 0
+
+	def get_parsed(self, day: int, path: Path) -> object:
+		"""Return the parsed input of day at path (from memory if the file
+		did not change since it was parsed)."""
+
+		status = path.stat()
+		key = (day, str(path.resolve()), status.st_mtime_ns, status.st_size)
+		with self.parsed_lock:
+			if (data := self.parsed.get(key)) is not None:
+				self.parsed.move_to_end(key)
+				return data
+
+		data = self.solvers.parse(day, path)
+		with self.parsed_lock:
+			self.parsed[key] = data
+			if len(self.parsed) > self.max_inputs:
+				self.parsed.popitem(last=False)
+		return data
+
+	def solve(self, day: int, path: Path) -> tuple[int, int]:
+		"""Return the solutions for day for the input at path."""
+
+		module = self.solvers.get_day_module(day)
+		solutions: tuple[int, int] = \
+			module.solve_parsed(self.get_parsed(day, path))
+		return solutions
+
+	async def answer(self, request: object) -> dict[str, Any]:
+		"""Return the answer to a single (decoded JSON) request."""
+
+		self.nr_requests += 1
+		if not isinstance(request, dict):
+			return {"error": "bad request: not a JSON object"}
+		if request.get("command") == "stats":
+			return {"requests": self.nr_requests,
+			        "parsed_inputs": len(self.parsed)}
+		try:
+			solutions = await asyncio.to_thread(
+				self.solve, int(request["day"]), Path(request["path"]))
+		except Exception as error:  # answer, and keep serving others
+			return {"error": f"{type(error).__name__}: {error}"}
+		return {"solutions": list(solutions)}
+
+	async def handle_client(self, reader: asyncio.StreamReader,
+	                        writer: asyncio.StreamWriter) -> None:
+		"""Answer all requests (one per line) of a client connection."""
+
+		try:
+			while line := await reader.readline():
+				try:
+					answer = await self.answer(json.loads(line))
+				except (ValueError, TypeError) as error:
+					answer = {"error": f"bad request: {error}"}
+				writer.write(json.dumps(answer).encode() + b"\n")
+				await writer.drain()
+		finally:
+			writer.close()
+
+	async def serve(self, socket_path: Path) -> None:
+		"""Serve requests on socket_path until SIGINT or SIGTERM."""
+
+		stop = asyncio.Event()
+		loop = asyncio.get_running_loop()
+		for signal_nr in (SIGINT, SIGTERM):
+			loop.add_signal_handler(signal_nr, stop.set)
+
+		socket_path.unlink(missing_ok=True)
+		server = await asyncio.start_unix_server(self.handle_client,
+		                                         socket_path)
+		try:
+			async with server:
+				await stop.wait()
+		finally:
+			socket_path.unlink(missing_ok=True)
+
+
+async def request(socket_path: Path, requests: list[dict[str, Any]]) \
+	-> list[tuple[dict[str, Any], float]]:
+	"""Send requests (over one connection) and return each answer with its
+	latency in seconds."""
+
+	reader, writer = await asyncio.open_unix_connection(socket_path)
+	answers = []
+	try:
+		for message in requests:
+			start_time = perf_counter()
+			writer.write(json.dumps(message).encode() + b"\n")
+			await writer.drain()
+			answer = json.loads(await reader.readline())
+			answers.append((answer, perf_counter() - start_time))
+	finally:
+		writer.close()
+		await writer.wait_closed()
+	return answers
+
+
+def main() -> int:
+	"""Command line entry point."""
+
+	parser = ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--socket", type=Path, default=DEFAULT_SOCKET)
+	commands = parser.add_subparsers(dest="command", required=True)
+	serve_parser = commands.add_parser("serve", help="run the daemon")
+	serve_parser.add_argument("--max-inputs", type=int, default=64,
+	                          help="nr of parsed inputs kept in memory")
+	solve_parser = commands.add_parser("solve", help="solve an input")
+	solve_parser.add_argument("day", type=int)
+	solve_parser.add_argument("path", type=Path)
+	solve_parser.add_argument("--repeat", type=int, default=1,
+	                          help="send the request this many times and "
+	                               "report the median latency")
+	commands.add_parser("stats", help="show daemon statistics")
+	args = parser.parse_args()
+
+	if args.command == "serve":
+		asyncio.run(SolverDaemon(args.max_inputs).serve(args.socket))
+		return 0
+
+	if args.command == "stats":
+		answers = asyncio.run(request(args.socket, [{"command": "stats"}]))
+		print(answers[0][0])
+		return 0
+
+	message = {"day": args.day, "path": str(args.path.resolve())}
+	answers = asyncio.run(request(args.socket, [message] * args.repeat))
+	answer = answers[-1][0]
+	if "error" in answer:
+		print(answer["error"], file=sys.stderr)
+		return 1
+	print(*answer["solutions"])
+	if args.repeat > 1:
+		latency = median(latency for _, latency in answers)
+		print(f"median latency {latency * 1000:.3f} ms")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,370 @@
+"""Seeded generators of valid (synthetic) inputs for all AoC 2023 days.
+
+Each generator takes a random.Random and a size and returns the complete
+input text. The meaning of size differs per day (see DEFAULT_SIZES); the
+defaults give inputs comparable to the shipped DayNN_input.txt files, and
+generate() refuses sizes outside MIN_SIZES ... MAX_SIZES, e.g.
+
+	python generators.py 3 10 --scale 10 --output-dir scaled
+"""
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from collections import defaultdict
+from collections.abc import Callable
+from pathlib import Path
+from random import Random
+from string import ascii_letters
+from typing import TypeAlias
+
+Generator: TypeAlias = Callable[[Random, int], str]
+
+# Size per day: Day01/02/04/07/09: nr of lines, Day03/10/11: grid side,
+# Day05: nr of map lines per map, Day06: nr of races, Day08: nr of nodes.
+DEFAULT_SIZES = {1: 1000, 2: 100, 3: 140, 4: 190, 5: 25, 6: 4, 7: 1000,
+                 8: 760, 9: 200, 10: 140, 11: 140}
+# Smallest sizes with a valid input: Day10 needs room for a loop.
+MIN_SIZES = {10: 5}
+# Largest sizes: Day06's part 2 time must stay below 2^26.5, so time * time
+# is exact as a float (Day06 uses math.sqrt), Day07 has 13^5 different
+# hands and Day08 runs out of 3-letter node names.
+MAX_SIZES = {6: 4, 7: 13 ** 5, 8: 135_000}
+
+DEFAULT_OUTPUT_DIR = Path("generated")
+
+DIGITS_AS_TEXT = ("one", "two", "three", "four", "five", "six", "seven",
+                  "eight", "nine")
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def generate_day01(rng: Random, size: int) -> str:
+	"""Return size lines of letters with digits and digits-as-text mixed in.
+	Each line has at least one digit."""
+
+	lines = []
+	for _ in range(size):
+		parts = [rng.choice(DIGITS_AS_TEXT) if rng.random() < 0.3
+		         else "".join(rng.choices(LETTERS, k=rng.randint(1, 5)))
+		         for _ in range(rng.randint(1, 5))]
+		parts.insert(rng.randint(0, len(parts)), str(rng.randint(1, 9)))
+		lines.append("".join(parts))
+	return "\n".join(lines) + "\n"
+
+
+def generate_day02(rng: Random, size: int) -> str:
+	"""Return size games of 1 to 6 draws. Each color is in at least one
+	draw."""
+
+	colors = ("red", "green", "blue")
+	lines = []
+	for game_nr in range(1, size + 1):
+		draws = [[color for color in colors if rng.random() < 0.6]
+		         for _ in range(rng.randint(1, 6))]
+		for color in colors:
+			if not any(color in draw for draw in draws):
+				rng.choice(draws).append(color)
+		text = "; ".join(", ".join(f"{rng.randint(1, 20)} {color}"
+		                           for color in rng.sample(draw, len(draw)))
+		                 for draw in draws if draw)
+		lines.append(f"Game {game_nr}: {text}")
+	return "\n".join(lines) + "\n"
+
+
+def generate_day03(rng: Random, size: int) -> str:
+	"""Return a size x size schematic with numbers (1 to 3 digits) and
+	symbols scattered over a background of dots."""
+
+	symbols = "*#+$/@=%&-"
+	lines = []
+	for _ in range(size):
+		line: list[str] = []
+		while len(line) < size:
+			draw = rng.random()
+			if draw < 0.08:
+				line.append(rng.choice(symbols))
+			elif draw < 0.2:
+				number = str(rng.randint(1, 999))[:size - len(line)]
+				line.extend(number)
+				if len(line) < size:
+					line.append(".")
+			else:
+				line.append(".")
+		lines.append("".join(line))
+	return "\n".join(lines) + "\n"
+
+
+def generate_day04(rng: Random, size: int) -> str:
+	"""Return size cards with 10 winning nrs and 25 nrs. Most cards win
+	nothing, so the nr of card copies stays within reasonable bounds."""
+
+	lines = []
+	for card_nr in range(1, size + 1):
+		nr_wins = 0 if rng.random() < 0.7 else rng.randint(1, 3)
+		numbers = rng.sample(range(1, 100), 35 - nr_wins)
+		winning = numbers[:10]
+		mine = winning[:nr_wins] + numbers[10:]
+		rng.shuffle(mine)
+		lines.append(f"Card {card_nr:>3}: "
+		             f"{' '.join(f'{nr:>2}' for nr in winning)} | "
+		             f"{' '.join(f'{nr:>2}' for nr in mine)}")
+	return "\n".join(lines) + "\n"
+
+
+def generate_day05(rng: Random, size: int) -> str:
+	"""Return an almanac with 10 seed ranges and 7 maps of size
+	non-overlapping map lines each."""
+
+	upper = 1 << 32
+	seeds: list[int] = []
+	for _ in range(10):
+		start = rng.randrange(upper >> 1)
+		seeds.extend((start, rng.randint(1, upper >> 4)))
+
+	names = ("seed", "soil", "fertilizer", "water", "light", "temperature",
+	         "humidity", "location")
+	blocks = [f"seeds: {' '.join(map(str, seeds))}"]
+	for source_name, destination_name in zip(names, names[1:]):
+		cuts = sorted(rng.sample(range(upper), 2 * size))
+		lines = []
+		for first, last in zip(cuts[::2], cuts[1::2]):
+			length = last - first + 1
+			destination = rng.randrange(upper - length)
+			lines.append(f"{destination} {first} {length}")
+		rng.shuffle(lines)
+		blocks.append("\n".join([f"{source_name}-to-{destination_name} map:",
+		                         *lines]))
+	return "\n\n".join(blocks) + "\n"
+
+
+def generate_day06(rng: Random, size: int) -> str:
+	"""Return times and distances of size (at most 4) races. Times have 2
+	digits and distances 4 digits, so the concatenated race of part 2 is
+	winnable too, and its time * time is below 2^53 (exact as a float)."""
+
+	while True:
+		times = [rng.randint(64, 99) for _ in range(size)]
+		distances = [rng.randint(1000, time * time // 4 - 1)
+		             for time in times]
+		time = int("".join(map(str, times)))
+		distance = int("".join(map(str, distances)))
+		if 4 * distance < time * time < 1 << 53:
+			break
+	return (f"Time:     {' '.join(f'{time:>6}' for time in times)}\n"
+	        f"Distance: {' '.join(f'{dist:>6}' for dist in distances)}\n")
+
+
+def generate_day07(rng: Random, size: int) -> str:
+	"""Return size unique hands with bids (size can be at most 13^5). Hands
+	are drawn as nrs 0 ... 13^5 - 1 with the cards as base 13 digits."""
+
+	cards = "23456789TJQKA"
+	lines = []
+	for hand_nr in rng.sample(range(13 ** 5), size):
+		hand = []
+		for _ in range(5):
+			hand_nr, card = divmod(hand_nr, 13)
+			hand.append(cards[card])
+		lines.append(f"{''.join(hand)} {rng.randint(1, 1000)}\n")
+	return "".join(lines)
+
+
+def generate_day08(rng: Random, size: int) -> str:
+	"""Return instructions and a network of about size nodes (at most
+	MAX_SIZES[8]). There are six ghosts, the first from AAA to ZZZ. Ghost i
+	walks a cycle of length L * p[i] (L the prime nr of instructions, p[i]
+	prime) in which every position but the xxZ node has a left and a right
+	twin, so path lengths do not depend on the instructions, as in the real
+	input."""
+
+	cycle_primes = (3, 5, 7, 11, 13, 17)
+	budget = max(2, size // (2 * sum(cycle_primes)))
+	nr_instructions = max(prime for prime in range(2, budget + 1)
+	                      if all(prime % d for d in range(2, prime)))
+	instructions = "".join(rng.choices("LR", k=nr_instructions))
+
+	# Day08 reads keys of 3 letters (either case); start and stop keys are
+	# the only ones ending with 'A' or 'Z'.
+	inner_names = [f"{a}{b}{c}" for a in ascii_letters for b in ascii_letters
+	               for c in ascii_letters if c not in "AZ"]
+	start_names = ["AAA", *(f"{a}{b}A" for a, b in
+	                        rng.sample([(a, b) for a in LETTERS.upper()
+	                                    for b in LETTERS.upper()
+	                                    if (a, b) != ("A", "A")
+	                                    and (a, b) != ("Z", "Z")], 5))]
+	stop_names = ["ZZZ", *(f"{name[:2]}Z" for name in start_names[1:])]
+	nr_inner = sum(2 * (nr_instructions * prime - 1) for prime in cycle_primes)
+	if nr_inner > len(inner_names):
+		raise ValueError(f"Day08 network of size {size} needs {nr_inner} "
+		                 f"node names, only {len(inner_names)} available")
+	inner = iter(rng.sample(inner_names, nr_inner))
+
+	nodes = []
+	for prime, start, stop in zip(cycle_primes, start_names, stop_names):
+		twins = [(next(inner), next(inner))
+		         for _ in range(nr_instructions * prime - 1)] + [(stop, stop)]
+		nodes.append((start, twins[0]))
+		nodes.append((stop, twins[0]))
+		nodes.extend((twin, successors)
+		             for pair, successors in zip(twins, twins[1:])
+		             for twin in pair)
+	rng.shuffle(nodes)
+
+	return instructions + "\n\n" + "".join(f"{key} = ({left}, {right})\n"
+	                                       for key, (left, right) in nodes)
+
+
+def generate_day09(rng: Random, size: int) -> str:
+	"""Return size lines of 21 values of polynomials with small integer
+	coefficients (degree at most 10)."""
+
+	lines = []
+	for _ in range(size):
+		coefficients = [rng.randint(-5, 5) for _ in range(rng.randint(1, 11))]
+		values = [sum(coefficient * x ** power
+		              for power, coefficient in enumerate(coefficients))
+		          for x in range(21)]
+		lines.append(" ".join(map(str, values)))
+	return "\n".join(lines) + "\n"
+
+
+def can_grow(region: set[tuple[int, int]], block: tuple[int, int]) -> bool:
+	"""Return True if adding block to region keeps its outline a single
+	simple loop: the region neighbors of block (8-neighborhood) must form one
+	run, and a diagonal neighbor must share an orthogonal neighbor with it."""
+
+	row, col = block
+	ring = [(row + d_row, col + d_col) in region
+	        for d_row, d_col in ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0),
+	                             (1, -1), (0, -1), (-1, -1))]
+	nr_runs = sum(ring[i] and not ring[i - 1] for i in range(8))
+	pinched = any(ring[i] and not ring[i - 1] and not ring[(i + 1) % 8]
+	              for i in (1, 3, 5, 7))
+	return nr_runs == 1 and not pinched
+
+
+def generate_day10(rng: Random, size: int) -> str:
+	"""Return a size x size maze with a single closed loop through 'S'. The
+	loop is the outline of a random region of blocks: block corners and edge
+	midpoints are tiles on the loop, block centers are inside. All other tiles
+	are random junk."""
+
+	nr_blocks = (size - 3) // 2
+	region = {(nr_blocks // 2, nr_blocks // 2)}
+	deltas = ((0, 1), (1, 0), (0, -1), (-1, 0))
+	frontier = [(nr_blocks // 2 + d_row, nr_blocks // 2 + d_col)
+	            for d_row, d_col in deltas]
+	while frontier and len(region) < 0.4 * nr_blocks * nr_blocks:
+		block = frontier.pop(rng.randrange(len(frontier)))
+		if block in region or not all(0 <= n < nr_blocks for n in block) \
+			or not can_grow(region, block):
+			continue
+		region.add(block)
+		frontier.extend((block[0] + d_row, block[1] + d_col)
+		                for d_row, d_col in deltas)
+
+	# links[(row, col)] is the set of (d_row, d_col) the tile connects to.
+	links: dict[tuple[int, int], set[tuple[int, int]]] = defaultdict(set)
+	for row, col in region:
+		for (d_row, d_col), corners in zip(
+			deltas, (((row, col + 1), (row + 1, col + 1)),
+			         ((row + 1, col), (row + 1, col + 1)),
+			         ((row, col), (row + 1, col)),
+			         ((row, col), (row, col + 1)))):
+			if (row + d_row, col + d_col) in region:
+				continue
+			(first, last) = ((2 * r + 1, 2 * c + 1) for r, c in corners)
+			middle = ((first[0] + last[0]) // 2, (first[1] + last[1]) // 2)
+			step = ((last[0] - first[0]) // 2, (last[1] - first[1]) // 2)
+			back = (-step[0], -step[1])
+			links[first].add(step)
+			links[middle].update((back, step))
+			links[last].add(back)
+
+	links_to_pipe = {frozenset({(-1, 0), (1, 0)}): "|",
+	                 frozenset({(0, -1), (0, 1)}): "-",
+	                 frozenset({(-1, 0), (0, 1)}): "L",
+	                 frozenset({(-1, 0), (0, -1)}): "J",
+	                 frozenset({(1, 0), (0, -1)}): "7",
+	                 frozenset({(1, 0), (0, 1)}): "F"}
+	grid = [[rng.choice(".|-LJ7F") for _ in range(size)] for _ in range(size)]
+	for (row, col), directions in links.items():
+		grid[row][col] = links_to_pipe[frozenset(directions)]
+
+	s_row, s_col = rng.choice(sorted(links))
+	grid[s_row][s_col] = "S"
+	for d_row, d_col in deltas:
+		if (s_row + d_row, s_col + d_col) not in links:
+			grid[s_row + d_row][s_col + d_col] = "."   # junk could point at S
+
+	return "".join("".join(line) + "\n" for line in grid)
+
+
+def generate_day11(rng: Random, size: int) -> str:
+	"""Return a size x size image with about 2% galaxies and about 5% empty
+	rows and cols."""
+
+	empty_rows = set(rng.sample(range(size), size // 20))
+	empty_cols = set(rng.sample(range(size), size // 20))
+	return "".join("".join("#" if row not in empty_rows
+	                       and col not in empty_cols
+	                       and rng.random() < 0.02 else "."
+	                       for col in range(size)) + "\n"
+	               for row in range(size))
+
+
+GENERATORS: dict[int, Generator] = {
+	1: generate_day01, 2: generate_day02, 3: generate_day03,
+	4: generate_day04, 5: generate_day05, 6: generate_day06,
+	7: generate_day07, 8: generate_day08, 9: generate_day09,
+	10: generate_day10, 11: generate_day11}
+
+
+def get_size(day: int, scale: float) -> int:
+	"""Return the size for day that is scale times the default size, within
+	the day's MIN_SIZES ... MAX_SIZES."""
+
+	size = max(MIN_SIZES.get(day, 1), round(DEFAULT_SIZES[day] * scale))
+	return min(size, MAX_SIZES.get(day, size))
+
+
+def generate(day: int, size: int | None = None, seed: int = 0) -> str:
+	"""Return a generated input for day (default size if size is None). The
+	same (day, size, seed) always gives the same input. Raise ValueError if
+	size is outside the day's MIN_SIZES ... MAX_SIZES."""
+
+	size = size or DEFAULT_SIZES[day]
+	min_size = MIN_SIZES.get(day, 1)
+	if not min_size <= size <= MAX_SIZES.get(day, size):
+		raise ValueError(f"size {size} out of range for Day{day:02} "
+		                 f"({min_size} ... {MAX_SIZES.get(day, 'any')})")
+	return GENERATORS[day](Random(seed), size)
+
+
+def main() -> None:
+	"""Command line entry point: write generated DayNN_input.txt files (never
+	over the shipped inputs)."""
+
+	parser = ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("days", nargs="*", type=int,
+	                    help="day nrs to generate (default: all)")
+	parser.add_argument("--size", type=int,
+	                    help="size (overrides --scale)")
+	parser.add_argument("--scale", type=float, default=1.0,
+	                    help="multiply default sizes by this factor")
+	parser.add_argument("--seed", type=int, default=0)
+	parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT_DIR,
+	                    help=f"default: {DEFAULT_OUTPUT_DIR}")
+	args = parser.parse_args()
+
+	if args.output_dir.resolve() == Path(__file__).resolve().parent:
+		parser.error("output dir holds the shipped inputs, use another one")
+	args.output_dir.mkdir(parents=True, exist_ok=True)
+	for day in args.days or sorted(GENERATORS):
+		size = args.size or get_size(day, args.scale)
+		path = args.output_dir / f"Day{day:02}_input.txt"
+		path.write_text(generate(day, size, args.seed))
+		print(f"{path} (size {size})")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,180 @@
+"""Compact rectangular grid of single-byte cells, shared by the grid days.
+
+A Grid keeps the puzzle input as is, in one buffer (bytes, or an mmap of the
+input file): cell (row, col) is the byte at offset row * stride + col, where
+stride is the line length including its line end. Rows and columns are
+zero-copy memoryviews, and searching uses bytes.find, so no per-cell objects
+are made. Per-cell flags go in Bitset layers, indexed by offset, e.g.
+
+	grid = Grid.from_source(source)
+	for row, col in grid.find_all(b"#"):
+		...
+	seen = grid.add_layer("seen")
+	seen.add(grid.get_offset(row, col))
+"""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from mmap import ACCESS_READ, mmap
+from os import fstat
+from stat import S_ISREG
+from typing import TypeAlias
+
+from streams import Source, as_bytes
+
+Buffer: TypeAlias = bytes | bytearray | mmap
+Coordinate: TypeAlias = tuple[int, int]
+
+
+class Bitset:
+	"""A set of ints 0 ... size - 1, stored as one bit each."""
+
+	__slots__ = ("bits",)
+
+	def __init__(self, size: int) -> None:
+		self.bits = bytearray((size + 7) >> 3)
+
+	def add(self, index: int) -> None:
+		"""Add index to the set."""
+
+		self.bits[index >> 3] |= 1 << (index & 7)
+
+	def discard(self, index: int) -> None:
+		"""Remove index from the set (if present)."""
+
+		self.bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+	def __contains__(self, index: int) -> bool:
+		return bool(self.bits[index >> 3] >> (index & 7) & 1)
+
+	def __len__(self) -> int:
+		return int.from_bytes(self.bits, "little").bit_count()
+
+
+class Grid:
+	"""The cells of a text grid, in the buffer holding the text. All lines
+	must have the same length (the last line may lack its line end)."""
+
+	def __init__(self, buffer: Buffer) -> None:
+		self.buffer = buffer
+		line_end = buffer.find(b"\n")
+		self.stride = line_end + 1 if line_end >= 0 else len(buffer) + 1
+		self.nr_cols = self.stride - 1
+		if self.nr_cols and buffer[self.nr_cols - 1] == ord("\r"):
+			self.nr_cols -= 1
+		self.nr_rows = (len(buffer) + self.stride - 1) // self.stride
+		self.layers: dict[str, Bitset] = {}
+
+	@classmethod
+	def from_source(cls, source: Source) -> Grid:
+		"""Return the grid for source. A non-empty regular file at its start
+		is mapped into memory (and not read), other sources (buffers, pipes,
+		in-memory streams, ...) are read into memory from their current
+		position."""
+
+		if isinstance(source, (str, bytes, bytearray, memoryview)):
+			return cls(as_bytes(source))
+		try:
+			file_nr = source.fileno()
+			if source.seekable() and source.tell() == 0 \
+				and S_ISREG((status := fstat(file_nr)).st_mode) \
+				and status.st_size > 0:
+				return cls(mmap(file_nr, 0, access=ACCESS_READ))
+		except (OSError, ValueError):   # no (mappable) file
+			pass
+		return cls(as_bytes(source))
+
+	def close(self) -> None:
+		"""Unmap the buffer, if it is an mmap (all views must be released)."""
+
+		if isinstance(self.buffer, mmap):
+			self.buffer.close()
+
+	def __enter__(self) -> Grid:
+		return self
+
+	def __exit__(self, *exc_info: object) -> None:
+		self.close()
+
+	def get_offset(self, row: int, col: int) -> int:
+		"""Return the offset of the cell at row, col in the buffer."""
+
+		return row * self.stride + col
+
+	def get_coordinate(self, offset: int) -> Coordinate:
+		"""Return row, col of the cell at offset in the buffer."""
+
+		return divmod(offset, self.stride)
+
+	def __getitem__(self, coordinate: Coordinate) -> int:
+		"""Return the byte at (row, col)."""
+
+		row, col = coordinate
+		return self.buffer[row * self.stride + col]
+
+	def contains(self, row: int, col: int) -> bool:
+		"""Return True if row, col is a cell of the grid."""
+
+		return 0 <= row < self.nr_rows and 0 <= col < self.nr_cols
+
+	def get_row(self, row: int) -> memoryview:
+		"""Return a (zero-copy) view of the cells on row."""
+
+		start = row * self.stride
+		return memoryview(self.buffer)[start:start + self.nr_cols]
+
+	def get_col(self, col: int) -> memoryview:
+		"""Return a (zero-copy, strided) view of the cells in col."""
+
+		stop = col + (self.nr_rows - 1) * self.stride + 1
+		return memoryview(self.buffer)[col:stop:self.stride]
+
+	def around(self, row: int, start: int, end: int) -> Iterator[Coordinate]:
+		"""Yield the cells (inside the grid) around the cells start ... end - 1
+		on row, diagonals included."""
+
+		first_col = max(start - 1, 0)
+		last_col = min(end, self.nr_cols - 1)
+		if row > 0:
+			for col in range(first_col, last_col + 1):
+				yield row - 1, col
+		if start > 0:
+			yield row, start - 1
+		if end < self.nr_cols:
+			yield row, end
+		if row + 1 < self.nr_rows:
+			for col in range(first_col, last_col + 1):
+				yield row + 1, col
+
+	def neighbours(self, row: int, col: int, diagonal: bool = False) \
+		-> Iterator[Coordinate]:
+		"""Yield the (up to 4, or 8 with diagonal) cells next to row, col."""
+
+		if diagonal:
+			yield from self.around(row, col, col + 1)
+			return
+		for delta_row, delta_col in ((-1, 0), (0, -1), (0, 1), (1, 0)):
+			if self.contains(row + delta_row, col + delta_col):
+				yield row + delta_row, col + delta_col
+
+	def find_all_offsets(self, value: bytes) -> Iterator[int]:
+		"""Yield the offset of every occurrence of value in the buffer."""
+
+		find = self.buffer.find
+		offset = find(value)
+		while offset >= 0:
+			yield offset
+			offset = find(value, offset + 1)
+
+	def find_all(self, value: bytes) -> Iterator[Coordinate]:
+		"""Yield row, col of every occurrence of value (in reading order)."""
+
+		stride = self.stride
+		for offset in self.find_all_offsets(value):
+			yield divmod(offset, stride)
+
+	def add_layer(self, name: str) -> Bitset:
+		"""Return a new (empty) bitset layer name, indexed by offset."""
+
+		self.layers[name] = Bitset(self.nr_rows * self.stride)
+		return self.layers[name]
@@ -0,0 +1,78 @@
+"""Compare the Grid (grid.py) with the current structures of the grid days.
+
+For Day03 and Day10 a generated input (scale times the default size) is
+loaded both by the day's parse() and as a Grid (Day11's parse() itself scans
+a Grid). Per day the load time, the memory retained by the loaded structure
+(both get the input as text, so the Grid's encoded copy of it counts) and
+the time to solve with the default and the "grid" backend are reported, e.g.
+
+	python grid_benchmark.py --scale 10 --repeats 5
+"""
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from collections.abc import Callable
+from time import perf_counter
+from tracemalloc import get_traced_memory, start, stop
+
+from generators import generate, get_size
+from grid import Grid
+from solvers import get_backends, get_day_module
+
+GRID_DAYS = (3, 10)
+
+
+def time_best(function: Callable[[], object], repeats: int) -> float:
+	"""Return the best time of repeats calls of function."""
+
+	timings = []
+	for _ in range(repeats):
+		start_time = perf_counter()
+		function()
+		timings.append(perf_counter() - start_time)
+	return min(timings)
+
+
+def measure_retained(load: Callable[[str], object], text: str) -> int:
+	"""Return the nr of bytes still allocated by the result of load for
+	text."""
+
+	start()
+	try:
+		before = get_traced_memory()[0]
+		loaded = load(text)
+		retained = get_traced_memory()[0] - before
+	finally:
+		stop()
+	del loaded
+	return retained
+
+
+def main() -> None:
+	"""Command line entry point: print the comparison table."""
+
+	parser = ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--scale", type=float, default=10.0,
+	                    help="input size relative to default (default: 10)")
+	parser.add_argument("--seed", type=int, default=0)
+	parser.add_argument("--repeats", type=int, default=3)
+	args = parser.parse_args()
+
+	print(f"{'day':<5}{'structure':<11}{'load ms':>10}{'kept KiB':>12}"
+	      f"{'solve ms':>10}")
+	for day in GRID_DAYS:
+		module = get_day_module(day)
+		text = generate(day, get_size(day, args.scale), args.seed)
+		backends = get_backends(day)
+		for label, load, backend in (
+			("parse", module.parse, backends["default"]),
+			("Grid", Grid.from_source, backends["grid"])):
+			load_time = time_best(lambda: load(text), args.repeats)
+			retained = measure_retained(load, text)
+			solve_time = time_best(lambda: backend(text), args.repeats)
+			print(f"{day:<5}{label:<11}{load_time * 1000:>10.2f}"
+			      f"{retained / 1024:>12.1f}{solve_time * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,184 @@
+"""Opt-in instrumentation of the day solvers.
+
+Set the environment variable AOC_PROFILE (to anything but "" or "0") or call
+enable() to time named phases and count hot-loop iterations:
+
+	with phase("process_tables"):
+		...
+	count("get_nr_steps iterations", steps)
+
+When disabled, phase() returns a shared no-op context manager and count()
+returns immediately, so instrumented code pays one call per phase or count.
+Counts are therefore added once per loop, not once per iteration.
+
+The command line runs a day with instrumentation enabled and can also dump
+cProfile stats and collapsed stacks (for flamegraph.pl or speedscope), e.g.
+
+	python instrument.py 8 --cprofile day08.prof
+	python instrument.py 8 --collapsed day08.folded
+"""
+from __future__ import annotations
+
+import sys
+from argparse import ArgumentParser
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from cProfile import Profile
+from os import environ
+from pathlib import Path
+from threading import Event, Thread, get_ident
+from time import perf_counter
+from types import FrameType
+
+enabled = environ.get("AOC_PROFILE", "") not in ("", "0")
+timings: defaultdict[str, list[float]] = defaultdict(list)
+counters: Counter[str] = Counter()
+
+_disabled_phase: AbstractContextManager[None] = nullcontext()
+
+
+def enable(on: bool = True) -> None:
+	"""Switch instrumentation on (or off)."""
+
+	global enabled
+	enabled = on
+
+
+def reset() -> None:
+	"""Forget all recorded timings and counts."""
+
+	timings.clear()
+	counters.clear()
+
+
+@contextmanager
+def _timed_phase(name: str) -> Iterator[None]:
+	"""Record the duration of the with-block under name."""
+
+	start_time = perf_counter()
+	try:
+		yield
+	finally:
+		timings[name].append(perf_counter() - start_time)
+
+
+def phase(name: str) -> AbstractContextManager[None]:
+	"""Return a context manager that times its block as phase name (a no-op
+	if instrumentation is disabled)."""
+
+	return _timed_phase(name) if enabled else _disabled_phase
+
+
+def count(name: str, increment: int = 1) -> None:
+	"""Add increment to the counter name (if instrumentation is enabled)."""
+
+	if enabled:
+		counters[name] += increment
+
+
+def report() -> str:
+	"""Return a table of all phases (calls, total and mean in ms) and all
+	counters."""
+
+	lines = [f"{'phase':<40}{'calls':>8}{'total':>12}{'mean':>12}"]
+	for name, durations in timings.items():
+		total = sum(durations) * 1000
+		lines.append(f"{name:<40}{len(durations):>8}{total:>12.3f}"
+		             f"{total / len(durations):>12.3f}")
+	if counters:
+		lines.append(f"{'counter':<40}{'count':>8}")
+		lines.extend(f"{name:<40}{value:>8}"
+		             for name, value in counters.items())
+	return "\n".join(lines)
+
+
+def run_with_cprofile(function: Callable[[], object], stats_file: Path) \
+	-> object:
+	"""Return function(), run under cProfile. Dump the stats to stats_file
+	(for pstats, snakeviz, ...)."""
+
+	profiler = Profile()
+	try:
+		return profiler.runcall(function)
+	finally:
+		profiler.dump_stats(stats_file)
+
+
+def get_stack(frame: FrameType | None) -> str:
+	"""Return the stack of frame as 'outer;...;inner' (collapsed format)."""
+
+	names = []
+	while frame is not None:
+		code = frame.f_code
+		names.append(f"{code.co_name} ({Path(code.co_filename).name}"
+		             f":{code.co_firstlineno})")
+		frame = frame.f_back
+	return ";".join(reversed(names))
+
+
+def run_with_sampler(function: Callable[[], object], collapsed_file: Path,
+                     interval: float = 0.001) -> object:
+	"""Return function(), while a thread samples its stack every interval
+	seconds. Write the samples to collapsed_file in collapsed-stack format
+	('stack count' lines). Samples can not be taken more often than the
+	interpreter's switch interval (see sys.setswitchinterval)."""
+
+	samples: Counter[str] = Counter()
+	done = Event()
+	thread_id = get_ident()
+
+	def sample() -> None:
+		while not done.wait(interval):
+			if frame := sys._current_frames().get(thread_id):
+				samples[get_stack(frame)] += 1
+
+	sampler = Thread(target=sample, daemon=True)
+	sampler.start()
+	try:
+		return function()
+	finally:
+		done.set()
+		sampler.join()
+		collapsed_file.write_text("".join(f"{stack} {nr}\n"
+		                                  for stack, nr in samples.items()))
+
+
+def main() -> None:
+	"""Command line entry point: solve a day with instrumentation enabled
+	and print the report."""
+
+	# This file may run as __main__: use the module the solvers import.
+	import instrument
+	from solvers import get_input_path, solve_source
+
+	parser = ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("day", type=int)
+	parser.add_argument("input", nargs="?", type=Path,
+	                    help="input file (default: the day's input)")
+	profilers = parser.add_mutually_exclusive_group()
+	profilers.add_argument("--cprofile", type=Path,
+	                       help="dump cProfile stats to this file")
+	profilers.add_argument("--collapsed", type=Path,
+	                       help="write sampled collapsed stacks to this file")
+	args = parser.parse_args()
+
+	instrument.enable()
+	path = args.input or get_input_path(args.day)
+
+	def solve() -> object:
+		return solve_source(args.day, path)
+
+	if args.cprofile:
+		solutions = run_with_cprofile(solve, args.cprofile)
+	elif args.collapsed:
+		solutions = run_with_sampler(solve, args.collapsed)
+	else:
+		solutions = solve()
+
+	print(solutions)
+	print(instrument.report())
+
+
+if __name__ == "__main__":
+	main()
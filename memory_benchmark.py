@@ -0,0 +1,159 @@
+"""Memory footprint of all AoC 2023 days, measured with tracemalloc.
+
+For each day a generated input (scale times the default size) is parsed and
+solved. Per phase the peak and the retained (still allocated afterwards)
+memory are reported, also per input element: a cell for the grid days
+(Day03, Day10, Day11), a line for all other days. The report can be stored
+and compared with a baseline, failing when bytes per element grow, e.g.
+
+	python memory_benchmark.py --scale 10 --output memory.json
+	python memory_benchmark.py --scale 10 --baseline memory.json
+"""
+from __future__ import annotations
+
+import json
+import sys
+from argparse import ArgumentParser
+from io import StringIO
+from pathlib import Path
+from tracemalloc import get_traced_memory, reset_peak, start, stop
+from typing import Any, TypeAlias
+
+from generators import generate, get_size
+from solvers import discover_days, get_day_module
+
+Report: TypeAlias = dict[str, Any]
+
+GRID_DAYS = (3, 10, 11)
+
+
+def count_elements(day: int, text: str) -> int:
+	"""Return the nr of input elements: cells for grid days, else lines."""
+
+	lines = text.splitlines()
+	if day in GRID_DAYS:
+		return sum(map(len, lines))
+	return sum(1 for line in lines if line)
+
+
+def measure_day(day: int, text: str) -> Report:
+	"""Return peak and retained bytes (total and per element) of the parse
+	and solve phases of day for input text."""
+
+	module = get_day_module(day)
+	nr_elements = count_elements(day, text)
+	phases: Report = {}
+	stream = StringIO(text)     # not traced: only parse's own allocations
+
+	start()
+	try:
+		before = get_traced_memory()[0]
+		reset_peak()
+		data = module.parse(stream)
+		after, peak = get_traced_memory()
+		phases["parse"] = (peak - before, after - before)
+
+		before = after
+		reset_peak()
+		module.solve_parsed(data)
+		after, peak = get_traced_memory()
+		phases["solve"] = (peak - before, after - before)
+	finally:
+		stop()
+
+	return {"elements": nr_elements,
+	        "phases": {name: {"peak": peak,
+	                          "retained": retained,
+	                          "peak_per_element": peak / nr_elements,
+	                          "retained_per_element": retained / nr_elements}
+	                   for name, (peak, retained) in phases.items()}}
+
+
+def run(days: list[int] | None = None, scale: float = 10.0, seed: int = 0) \
+	-> Report:
+	"""Measure the requested days (all days if days is None)."""
+
+	selected = sorted(discover_days()) if days is None else days
+	report: Report = {"scale": scale, "seed": seed, "days": {}}
+
+	for day in selected:
+		text = generate(day, get_size(day, scale), seed)
+		report["days"][f"{day:02}"] = measure_day(day, text)
+
+	return report
+
+
+def compare(report: Report, baseline: Report, tolerance: float) -> list[str]:
+	"""Return a description of each day/phase/measure whose bytes per element
+	is more than tolerance (fraction) above the baseline."""
+
+	regressions = []
+
+	for day, day_report in report["days"].items():
+		if not (base_day := baseline["days"].get(day)):
+			continue
+		for name, stats in day_report["phases"].items():
+			if not (base_stats := base_day["phases"].get(name)):
+				continue
+			for measure in ("peak_per_element", "retained_per_element"):
+				# small absolute differences (a few bytes) are noise.
+				limit = max(base_stats[measure] * (1 + tolerance),
+				            base_stats[measure] + 1.0)
+				if stats[measure] > limit:
+					regressions.append(
+						f"Day {day} {name} {measure}: "
+						f"{stats[measure]:.1f} vs baseline "
+						f"{base_stats[measure]:.1f} bytes")
+
+	return regressions
+
+
+def print_report(report: Report) -> None:
+	"""Print a table with (per element) peak and retained memory."""
+
+	print(f"{'day':<5}{'phase':<8}{'elements':>10}{'peak KiB':>12}"
+	      f"{'B/elem':>10}{'kept KiB':>12}{'B/elem':>10}")
+	for day, day_report in report["days"].items():
+		for name, stats in day_report["phases"].items():
+			print(f"{day:<5}{name:<8}{day_report['elements']:>10}"
+			      f"{stats['peak'] / 1024:>12.1f}"
+			      f"{stats['peak_per_element']:>10.1f}"
+			      f"{stats['retained'] / 1024:>12.1f}"
+			      f"{stats['retained_per_element']:>10.1f}")
+
+
+def main() -> int:
+	"""Command line entry point. Return 1 if regressions were found."""
+
+	parser = ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("days", nargs="*", type=int,
+	                    help="day nrs to run (default: all)")
+	parser.add_argument("--scale", type=float, default=10.0,
+	                    help="input size relative to default (default: 10)")
+	parser.add_argument("--seed", type=int, default=0)
+	parser.add_argument("--output", type=Path,
+	                    help="write JSON report to this file")
+	parser.add_argument("--baseline", type=Path,
+	                    help="compare with this JSON report")
+	parser.add_argument("--tolerance", type=float, default=0.1,
+	                    help="allowed growth of bytes per element "
+	                         "(default: 0.1)")
+	args = parser.parse_args()
+
+	report = run(args.days or None, args.scale, args.seed)
+	print_report(report)
+
+	if args.output:
+		args.output.write_text(json.dumps(report, indent=2))
+
+	if args.baseline:
+		baseline = json.loads(args.baseline.read_text())
+		if regressions := compare(report, baseline, args.tolerance):
+			print("\n".join(["Regressions:", *regressions]))
+			return 1
+
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
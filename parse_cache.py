@@ -0,0 +1,123 @@
+"""On-disk cache of parsed inputs.
+
+Entries are keyed by day, the day's PARSER_VERSION and the SHA-256 of the
+input bytes, and stored with marshal. Days whose parse() output is not made
+of plain builtins provide pack(data) / unpack(packed) to convert it. Days
+without a PARSER_VERSION are always parsed: their parse() output can not be
+stored more compactly than the input itself (Day10's Matrix of Tiles), or
+keeps (a tokenized copy of) the text, which is parsed faster than loaded
+(Day01, Day06).
+
+The total size of the cache is bounded: after each store the least recently
+used entries (by modification time, which is refreshed on each hit) are
+removed until the cache fits.
+"""
+from __future__ import annotations
+
+import marshal
+from hashlib import sha256
+from mmap import mmap, ACCESS_READ
+from os import fdopen, replace, utime
+from pathlib import Path
+from tempfile import mkstemp
+from types import ModuleType
+from typing import Any
+
+from streams import Source, as_bytes
+
+DEFAULT_DIRECTORY = Path(__file__).resolve().parent / ".parse_cache"
+DEFAULT_MAX_BYTES = 64 << 20
+
+
+class ParseCache:
+	"""A size-bounded LRU cache of parsed inputs in a directory."""
+
+	def __init__(self, directory: Path = DEFAULT_DIRECTORY,
+	             max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+		self.directory = directory
+		self.max_bytes = max_bytes
+		self.hits = 0
+		self.misses = 0
+
+	def get_path(self, module: ModuleType, content: bytes) -> Path | None:
+		"""Return the cache file path for content parsed by module, or None if
+		the module's parse output can not be cached."""
+
+		if (version := getattr(module, "PARSER_VERSION", None)) is None:
+			return None
+		digest = sha256(content).hexdigest()
+		return self.directory / f"{module.__name__}-v{version}-{digest}.bin"
+
+	def load(self, module: ModuleType, path: Path) -> object | None:
+		"""Return the cached parse output at path (None if not cached)."""
+
+		try:
+			with open(path, "rb") as cache_file, \
+				mmap(cache_file.fileno(), 0, access=ACCESS_READ) as buffer:
+				packed = marshal.loads(buffer)
+		except (OSError, ValueError, EOFError, TypeError):
+			return None     # missing, empty or corrupt entry
+
+		utime(path)     # mark as recently used
+		unpack = getattr(module, "unpack", None)
+		data: object = unpack(packed) if unpack else packed
+		return data
+
+	def store(self, module: ModuleType, path: Path, data: object) -> None:
+		"""Store the parse output data at path and evict old entries."""
+
+		pack = getattr(module, "pack", None)
+		packed: Any = pack(data) if pack else data
+		self.directory.mkdir(parents=True, exist_ok=True)
+		# a temporary file per writer, so concurrent writers of the same
+		# entry never mix: replace then publishes a complete entry.
+		file_nr, temporary_name = mkstemp(suffix=".tmp", dir=self.directory)
+		try:
+			with fdopen(file_nr, "wb") as temporary_file:
+				marshal.dump(packed, temporary_file)
+			replace(temporary_name, path)
+		except BaseException:
+			Path(temporary_name).unlink(missing_ok=True)
+			raise
+		self.evict()
+
+	def parse(self, module: ModuleType, source: Source) -> object:
+		"""Return module.parse(source), from the cache if possible."""
+
+		content = as_bytes(source)
+		if (path := self.get_path(module, content)) is None:
+			return module.parse(content)
+
+		if (data := self.load(module, path)) is not None:
+			self.hits += 1
+			return data
+
+		self.misses += 1
+		data = module.parse(content)
+		self.store(module, path, data)
+		return data
+
+	def evict(self) -> None:
+		"""Remove least recently used entries until the cache fits in
+		max_bytes."""
+
+		entries = []
+		for path in self.directory.glob("*.bin"):
+			try:
+				status = path.stat()
+			except FileNotFoundError:   # removed by another process
+				continue
+			entries.append((status.st_mtime, status.st_size, path))
+
+		total = sum(size for _, size, _ in entries)
+		for _, size, path in sorted(entries):
+			if total <= self.max_bytes:
+				break
+			path.unlink(missing_ok=True)
+			total -= size
+
+	def clear(self) -> None:
+		"""Remove all entries."""
+
+		for path in self.directory.glob("*.bin"):
+			path.unlink(missing_ok=True)
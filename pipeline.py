@@ -0,0 +1,148 @@
+"""Asyncio pipeline that solves many input files.
+
+Files are read concurrently in threads, while a process pool solves the
+files read so far, so reading and computing overlap. At most read_ahead
+files are read but not yet solved: when the pool falls behind, reading
+waits (backpressure) and memory stays bounded. Results are yielded as soon
+as they are available, e.g.
+
+	python pipeline.py scaled/*.txt --workers 4 --read-ahead 8
+
+The day of a file is taken from its name (DayNN...) unless --day is given.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+from argparse import ArgumentParser
+from collections.abc import AsyncIterator, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from os import cpu_count
+from pathlib import Path
+from re import match
+from time import perf_counter
+
+from solvers import Solutions, solve_source
+
+
+@dataclass(frozen=True)
+class FileResult:
+	"""Solutions (or the error) for the input file of a day, and the time
+	the pool needed to solve it."""
+
+	day: int
+	path: Path
+	solutions: Solutions | None
+	error: str | None
+	solve_time: float
+
+
+def solve_content(day: int, content: bytes) -> tuple[Solutions, float]:
+	"""Return the solutions for content and the time to get them (this runs
+	in a worker process)."""
+
+	start_time = perf_counter()
+	solutions = solve_source(day, content)
+	return solutions, perf_counter() - start_time
+
+
+async def solve_files(jobs: Iterable[tuple[int, Path]],
+                      workers: int | None = None,
+                      read_ahead: int | None = None) \
+	-> AsyncIterator[FileResult]:
+	"""Yield a FileResult per (day, path) job, in order of completion. Jobs
+	are taken from jobs one by one: at most read_ahead (default: twice the
+	nr of workers) are in progress, so at most that many tasks exist and
+	files are in memory."""
+
+	workers = workers or cpu_count() or 1
+	loop = asyncio.get_running_loop()
+	job_iterator = iter(jobs)
+
+	with ProcessPoolExecutor(workers) as pool:
+
+		async def process(day: int, path: Path) -> FileResult:
+			try:
+				content = await asyncio.to_thread(path.read_bytes)
+				solutions, solve_time = await loop.run_in_executor(
+					pool, solve_content, day, content)
+			except Exception as error:  # report, and go on with others
+				return FileResult(day, path, None,
+				                  f"{type(error).__name__}: {error}", 0.0)
+			return FileResult(day, path, solutions, None, solve_time)
+
+		pending = {asyncio.create_task(process(day, path)) for day, path
+		           in islice(job_iterator, read_ahead or 2 * workers)}
+		try:
+			while pending:
+				done, pending = await asyncio.wait(
+					pending, return_when=asyncio.FIRST_COMPLETED)
+				for task in done:
+					# a finished job makes room for the next one.
+					for day, path in islice(job_iterator, 1):
+						pending.add(asyncio.create_task(process(day, path)))
+					yield task.result()
+		finally:
+			for task in pending:
+				task.cancel()
+
+
+def get_day(path: Path) -> int:
+	"""Return the day nr from a file name like 'Day05_input.txt'."""
+
+	if not (day_match := match(r"Day(\d\d)", path.name)):
+		raise ValueError(f"no day nr in file name {path.name}, use --day")
+	return int(day_match.group(1))
+
+
+async def run(jobs: list[tuple[int, Path]], workers: int | None,
+              read_ahead: int | None) -> int:
+	"""Solve all jobs, printing results as they arrive. Return the nr of
+	failed files."""
+
+	start_time = perf_counter()
+	nr_errors = 0
+	solve_time = 0.0
+
+	async for result in solve_files(jobs, workers, read_ahead):
+		if result.error:
+			nr_errors += 1
+			print(f"{result.path}: {result.error}", file=sys.stderr)
+		else:
+			solve_time += result.solve_time
+			print(f"{result.path} (day {result.day}): "
+			      f"{result.solutions}")
+
+	wall_time = perf_counter() - start_time
+	print(f"{len(jobs)} files in {wall_time:.3f}s "
+	      f"({len(jobs) / wall_time:.1f} files/s), "
+	      f"solving took {solve_time:.3f}s", file=sys.stderr)
+	return nr_errors
+
+
+def main() -> int:
+	"""Command line entry point. Return 1 if any file failed."""
+
+	parser = ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("paths", nargs="+", type=Path)
+	parser.add_argument("--day", type=int,
+	                    help="day of all files (default: from file names)")
+	parser.add_argument("--workers", type=int,
+	                    help="nr of worker processes (default: nr of cpus)")
+	parser.add_argument("--read-ahead", type=int,
+	                    help="max nr of files in memory (default: 2 x "
+	                         "workers)")
+	args = parser.parse_args()
+
+	try:
+		jobs = [(args.day or get_day(path), path) for path in args.paths]
+	except ValueError as error:
+		parser.error(str(error))
+	nr_errors = asyncio.run(run(jobs, args.workers, args.read_ahead))
+	return 1 if nr_errors else 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,184 @@
+"""Solve all days (and batches of inputs per day) concurrently.
+
+Jobs are scheduled on a process pool longest-expected-job-first. Expected
+durations are input size times a rate (seconds per byte) per day, taken from
+the median timings of a benchmark.py report if given, so the wall-clock time
+of a full run approaches that of the slowest job, e.g.
+
+	python benchmark.py --output timings.json
+	python pool_runner.py --timings timings.json --scale 10 --copies 4
+"""
+from __future__ import annotations
+
+import json
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from io import StringIO
+from os import cpu_count
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+from typing import Any
+
+from generators import generate, get_size
+from solvers import Solutions, discover_days, get_day_module, get_input_path
+
+# Seconds per input byte for days without a recorded rate (when no day has
+# one: any rate will do, only the order of the jobs matters).
+DEFAULT_RATE = 1e-7
+
+
+@dataclass(frozen=True)
+class Job:
+	"""A single input to solve for a day: the shipped input file (source is
+	None) or a generated input. Expected is the estimated duration in
+	seconds."""
+
+	day: int
+	name: str
+	source: str | None
+	expected: float
+
+
+@dataclass(frozen=True)
+class JobResult:
+	"""Solutions and timings (seconds) of a job."""
+
+	day: int
+	name: str
+	solutions: Solutions
+	parse_time: float
+	solve_time: float
+
+
+def run_job(job: Job) -> JobResult:
+	"""Solve the job (this runs in a worker process)."""
+
+	module = get_day_module(job.day)
+
+	start_time = perf_counter()
+	if job.source is None:
+		with open(get_input_path(job.day), "rb") as input_file:
+			data = module.parse(input_file)
+	else:
+		data = module.parse(StringIO(job.source))
+	parsed_time = perf_counter()
+	solutions = module.solve_parsed(data)
+	solved_time = perf_counter()
+
+	return JobResult(job.day, job.name, solutions,
+	                 parsed_time - start_time, solved_time - parsed_time)
+
+
+def get_rates(timings_file: Path | None) -> dict[int, float]:
+	"""Return the seconds per input byte per day: the median total time in a
+	benchmark.py report divided by the size of the input it was measured on
+	(an empty dict if there is no report)."""
+
+	if timings_file is None:
+		return {}
+	report = json.loads(timings_file.read_text())
+	rates = {}
+	for key, day_report in report["days"].items():
+		day = int(key)
+		if report["scale"] is None:
+			input_size = get_input_path(day).stat().st_size
+		else:
+			input_size = len(generate(day, get_size(day, report["scale"]),
+			                          report["seed"]))
+		rates[day] = day_report["total"]["median"] / input_size
+	return rates
+
+
+def make_jobs(days: list[int], copies: int, scale: float | None,
+              rates: dict[int, float]) -> list[Job]:
+	"""Return the jobs for days: the shipped input, plus copies generated
+	inputs (seeds 0, 1, ...) of scale times the default size. The expected
+	duration of a job is its input size times the day's rate; days without
+	a rate get the median of the known rates (or DEFAULT_RATE)."""
+
+	jobs = []
+	default_rate = median(rates.values()) if rates else DEFAULT_RATE
+
+	for day in days:
+		shipped_size = get_input_path(day).stat().st_size
+		rate = rates.get(day, default_rate)
+
+		inputs: list[tuple[str, str | None]] = [("input", None)]
+		if scale is not None:
+			size = get_size(day, scale)
+			inputs.extend((f"scale {scale} seed {seed}",
+			               generate(day, size, seed))
+			              for seed in range(copies))
+
+		for name, source in inputs:
+			input_size = shipped_size if source is None else len(source)
+			jobs.append(Job(day, name, source, rate * input_size))
+
+	return sorted(jobs, key=lambda job: job.expected, reverse=True)
+
+
+def run(jobs: list[Job], workers: int | None = None) -> dict[str, Any]:
+	"""Run jobs on a process pool (in the given order) and return a report
+	with the results, the wall-clock time and the summed job times."""
+
+	start_time = perf_counter()
+	results = []
+
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		futures = [executor.submit(run_job, job) for job in jobs]
+		for future in as_completed(futures):
+			results.append(future.result())
+
+	wall_time = perf_counter() - start_time
+	results.sort(key=lambda result: (result.day, result.name))
+	job_times = [result.parse_time + result.solve_time for result in results]
+
+	return {"workers": workers or cpu_count(),
+	        "wall_time": wall_time,
+	        "total_job_time": sum(job_times),
+	        "slowest_job_time": max(job_times, default=0.0),
+	        "results": [asdict(result) for result in results]}
+
+
+def main() -> None:
+	"""Command line entry point."""
+
+	parser = ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("days", nargs="*", type=int,
+	                    help="day nrs to run (default: all)")
+	parser.add_argument("--workers", type=int,
+	                    help="nr of worker processes (default: nr of cpus)")
+	parser.add_argument("--timings", type=Path,
+	                    help="benchmark.py JSON report with expected timings")
+	parser.add_argument("--scale", type=float,
+	                    help="also solve generated inputs of scale times the "
+	                         "default size")
+	parser.add_argument("--copies", type=int, default=1,
+	                    help="nr of generated inputs per day (default: 1)")
+	parser.add_argument("--output", type=Path,
+	                    help="write JSON report to this file")
+	args = parser.parse_args()
+
+	days = args.days or sorted(discover_days())
+	jobs = make_jobs(days, args.copies, args.scale,
+	                 get_rates(args.timings))
+	report = run(jobs, args.workers)
+
+	for result in report["results"]:
+		print(f"{result['day']:02} {result['name']:<24} "
+		      f"{result['parse_time'] * 1000:>10.3f} "
+		      f"{result['solve_time'] * 1000:>10.3f}  "
+		      f"{tuple(result['solutions'])}")
+	print(f"wall {report['wall_time']:.3f}s, "
+	      f"jobs {report['total_job_time']:.3f}s, "
+	      f"slowest {report['slowest_job_time']:.3f}s "
+	      f"({report['workers']} workers)")
+
+	if args.output:
+		args.output.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,303 @@
+"""Check the query and update structures of the days against linear scans.
+
+The day backends do not exercise every operation of these structures
+(Schematic.set_cell, LiveGame.remove, ChainIndex.get_seeds_below,
+DistanceTable.for_predicate / save / load, GalaxyIndex.set_expansion /
+get_nearest / get_within). Each is run on a generated input (scale times the
+default size) for random queries or updates, and every answer is compared
+with that of a linear scan (or a complete re-solve). Per structure the total
+time of both is reported, e.g.
+
+	python query_check.py --scale 1 --queries 200
+"""
+from __future__ import annotations
+
+import sys
+from argparse import ArgumentParser
+from collections.abc import Callable
+from pathlib import Path
+from random import Random
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Literal, TypeAlias
+
+from Day03_GearRatios import Schematic, solve_grid
+from Day05_SeedFertilizer import ChainIndex, parse as parse_almanac
+from Day07_CamelCards import LiveGame, parse as parse_game, \
+	solve_parsed as solve_game
+from Day08_HauntedWasteland import DistanceTable, NodesTable, \
+	parse as parse_network
+from Day11_CosmicExpansion import GalaxyIndex, expand, get_occupied_rows, \
+	parse as parse_star_map
+from generators import generate, get_size
+
+# (time of the structure, time of the linear scans, failed checks)
+Outcome: TypeAlias = tuple[float, float, list[str]]
+Check: TypeAlias = Callable[[str, Random, int], Outcome]
+
+CARDS = "23456789TJQKA"
+
+
+def check_schematic(text: str, rng: Random, nr_queries: int) -> Outcome:
+	"""Set random cells and compare the solutions with a re-solve."""
+
+	schematic = Schematic.from_source(text)
+	nr_rows, nr_cols = len(schematic.cells), len(schematic.cells[0])
+	structure_time = scan_time = 0.0
+	failures = []
+
+	for _ in range(nr_queries):
+		row, col = rng.randrange(nr_rows), rng.randrange(nr_cols)
+		char = rng.choice("0123456789...*#+")
+		start_time = perf_counter()
+		schematic.set_cell(row, col, char)
+		structure_time += perf_counter() - start_time
+
+		start_time = perf_counter()
+		expected = solve_grid("\n".join("".join(cells)
+		                                for cells in schematic.cells))
+		scan_time += perf_counter() - start_time
+		if schematic.solutions != expected:
+			failures.append(f"set_cell({row}, {col}, {char!r}): "
+			                f"{schematic.solutions}, expected {expected}")
+
+	return structure_time, scan_time, failures
+
+
+def check_live_game(text: str, rng: Random, nr_queries: int) -> Outcome:
+	"""Remove random hands and add new ones, and compare the winnings with
+	a re-solve."""
+
+	game = LiveGame()
+	for line in text.splitlines():
+		hand, bid_text = line.split()
+		game.add(hand, int(bid_text))
+	hands = list(game.bids)
+	structure_time = scan_time = 0.0
+	failures = []
+
+	for _ in range(nr_queries):
+		if hands and rng.random() < 0.5:
+			index = rng.randrange(len(hands))
+			hands[index], hands[-1] = hands[-1], hands[index]
+			hand = hands.pop()
+			operation = f"remove({hand!r})"
+			start_time = perf_counter()
+			game.remove(hand)
+			structure_time += perf_counter() - start_time
+		else:
+			while (hand := "".join(rng.choices(CARDS, k=5))) in game.bids:
+				pass
+			bid = rng.randrange(1, 1000)
+			hands.append(hand)
+			operation = f"add({hand!r}, {bid})"
+			start_time = perf_counter()
+			game.add(hand, bid)
+			structure_time += perf_counter() - start_time
+
+		start_time = perf_counter()
+		expected = solve_game(parse_game("".join(
+			f"{hand} {bid}\n" for hand, bid in game.bids.items())))
+		scan_time += perf_counter() - start_time
+		if game.winnings != expected:
+			failures.append(f"{operation}: {game.winnings}, expected "
+			                f"{expected}")
+
+	return structure_time, scan_time, failures
+
+
+def check_chain_index(text: str, rng: Random, nr_queries: int) -> Outcome:
+	"""Compare get_seeds_below with a scan of all segments, and the
+	locations of its interval ends and of random seeds with a conversion
+	through all maps."""
+
+	_, maps = parse_almanac(text)
+	index = ChainIndex(maps)
+	limit = 2 * max(map_line.interval.last + max(map_line.offset, 0)
+	                for map_lines in maps for map_line in map_lines.map_lines)
+	structure_time = scan_time = 0.0
+	failures = []
+
+	def convert(seed: int) -> int:
+		for map_lines in maps:
+			seed = map_lines.convert_nrs([seed])[0]
+		return seed
+
+	for _ in range(nr_queries):
+		location = rng.randrange(limit)
+		start_time = perf_counter()
+		below = index.get_seeds_below(location)
+		structure_time += perf_counter() - start_time
+
+		start_time = perf_counter()
+		expected = [(seeds.first, min(seeds.last, location - 1 - offset))
+		            for seeds, offset in index.segments
+		            if seeds.first + offset < location]
+		scan_time += perf_counter() - start_time
+		if sorted((seeds.first, seeds.last) for seeds in below) != expected:
+			failures.append(f"get_seeds_below({location}): {below}")
+		for seeds in rng.sample(below, min(len(below), 3)):
+			if max(convert(seeds.first), convert(seeds.last)) >= location:
+				failures.append(f"get_seeds_below({location}): {seeds} "
+				                f"reaches location {location} or above")
+
+		seed = rng.randrange(limit)
+		if index.get_location(seed) != convert(seed):
+			failures.append(f"get_location({seed}): "
+			                f"{index.get_location(seed)}, expected "
+			                f"{convert(seed)}")
+
+	return structure_time, scan_time, failures
+
+
+def walk_to_target(start_key: str, position: int,
+                   instructions: list[Literal[0, 1]],
+                   nodes_table: NodesTable, targets: set[str]) -> int | None:
+	"""Return the nr of steps (at least one) from start_key, starting at
+	instruction position, to a target by walking the network (None if no
+	target is reached within the nr of states)."""
+
+	key = start_key
+	for nr_steps in range(1, len(nodes_table) * len(instructions) + 1):
+		key = nodes_table[key][instructions[position]]
+		position = (position + 1) % len(instructions)
+		if key in targets:
+			return nr_steps
+	return None
+
+
+def check_distance_table(text: str, rng: Random, nr_queries: int) \
+	-> Outcome:
+	"""Build a table by predicate, save and load it, and compare the nr of
+	steps from random states with a walk through the network."""
+
+	network = parse_network(text)
+	instructions, z_keys, nodes_table = network
+	table = DistanceTable.for_predicate(network, lambda key: key[-1] == "Z")
+	structure_time = scan_time = 0.0
+	failures = []
+
+	if table.targets != sorted(z_keys):
+		failures.append(f"for_predicate targets: {table.targets}")
+	with TemporaryDirectory() as directory:
+		table.save(Path(directory) / "table.bin")
+		loaded = DistanceTable.load(Path(directory) / "table.bin")
+	if (loaded.keys, loaded.targets, loaded.instructions, loaded.successors,
+	    loaded.distances) != (table.keys, table.targets, table.instructions,
+	                          table.successors, table.distances):
+		failures.append("load: differs from the saved table")
+
+	targets = set(table.targets)
+	for _ in range(nr_queries):
+		start_key = rng.choice(table.keys)
+		position = rng.randrange(len(instructions))
+		start_time = perf_counter()
+		nr_steps = loaded.get_nr_steps(start_key, position)
+		structure_time += perf_counter() - start_time
+
+		start_time = perf_counter()
+		expected = walk_to_target(start_key, position, instructions,
+		                          nodes_table, targets)
+		scan_time += perf_counter() - start_time
+		if nr_steps != expected:
+			failures.append(f"get_nr_steps({start_key!r}, {position}): "
+			                f"{nr_steps}, expected {expected}")
+
+	return structure_time, scan_time, failures
+
+
+def check_galaxy_index(text: str, rng: Random, nr_queries: int) -> Outcome:
+	"""Change the expansion now and then, and compare nearest and radius
+	queries at random positions with a scan of all galaxies."""
+
+	star_map = parse_star_map(text)
+	index = GalaxyIndex(star_map)
+	structure_time = scan_time = 0.0
+	failures = []
+
+	for query in range(nr_queries):
+		if query % 20 == 0:
+			replace_by = rng.choice((1, 2, 10, 1_000_000))
+			index.set_expansion(replace_by)
+			if (index.xs, index.ys) != (
+				expand(star_map.cols, star_map.occupied_cols,
+				       star_map.nr_cols, replace_by),
+				expand(star_map.rows, get_occupied_rows(star_map),
+				       star_map.nr_rows, replace_by)):
+				failures.append(f"set_expansion({replace_by}): positions "
+				                f"differ")
+		width = max(index.xs, default=0) + max(index.ys, default=0)
+		x = rng.randrange(max(index.xs, default=0) + 1)
+		y = rng.randrange(max(index.ys, default=0) + 1)
+		k = rng.randrange(1, 10)
+		radius = rng.randrange(width // 4 + 1)
+		start_time = perf_counter()
+		nearest = index.get_nearest(x, y, k)
+		within = index.get_within(x, y, radius)
+		structure_time += perf_counter() - start_time
+
+		start_time = perf_counter()
+		distances = sorted((abs(galaxy_x - x) + abs(galaxy_y - y), galaxy)
+		                   for galaxy, (galaxy_x, galaxy_y)
+		                   in enumerate(zip(index.xs, index.ys)))
+		expected_within = [found for found in distances
+		                   if found[0] <= radius]
+		scan_time += perf_counter() - start_time
+		if nearest != distances[:k]:
+			failures.append(f"get_nearest({x}, {y}, {k}): {nearest}, "
+			                f"expected {distances[:k]}")
+		if within != expected_within:
+			failures.append(f"get_within({x}, {y}, {radius}): "
+			                f"{len(within)} galaxies, expected "
+			                f"{len(expected_within)}")
+
+	return structure_time, scan_time, failures
+
+
+# structure name -> (day, check)
+CHECKS: dict[str, tuple[int, Check]] = {
+	"Schematic": (3, check_schematic),
+	"ChainIndex": (5, check_chain_index),
+	"LiveGame": (7, check_live_game),
+	"DistanceTable": (8, check_distance_table),
+	"GalaxyIndex": (11, check_galaxy_index)}
+
+
+def main() -> int:
+	"""Command line entry point. Return 1 if a check failed."""
+
+	parser = ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("structures", nargs="*",
+	                    help=f"structures to check (default: all of "
+	                         f"{', '.join(CHECKS)})")
+	parser.add_argument("--scale", type=float, default=1.0,
+	                    help="input size relative to default (default: 1)")
+	parser.add_argument("--seed", type=int, default=0)
+	parser.add_argument("--queries", type=int, default=200,
+	                    help="nr of queries or updates per structure "
+	                         "(default: 200)")
+	args = parser.parse_args()
+	if unknown := set(args.structures) - set(CHECKS):
+		parser.error(f"unknown structures: {', '.join(sorted(unknown))}")
+
+	all_failures: list[str] = []
+	print(f"{'structure':<15}{'day':>4}{'queries':>9}{'ms':>10}"
+	      f"{'scan ms':>10}  result")
+	for name in args.structures or CHECKS:
+		day, check = CHECKS[name]
+		text = generate(day, get_size(day, args.scale), args.seed)
+		structure_time, scan_time, failures = \
+			check(text, Random(args.seed), args.queries)
+		print(f"{name:<15}{day:>4}{args.queries:>9}"
+		      f"{structure_time * 1000:>10.2f}{scan_time * 1000:>10.2f}  "
+		      f"{f'{len(failures)} failed' if failures else 'ok'}")
+		all_failures.extend(f"{name} {failure}" for failure in failures)
+
+	if all_failures:
+		print("\n".join(["Failed:", *all_failures]))
+		return 1
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
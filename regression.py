@@ -0,0 +1,289 @@
+"""Answer-verified performance regression suite of all AoC 2023 days.
+
+Every backend of every day (see solvers.get_backends) solves the shipped
+input and a generated input (scale times the default size). A run fails when
+- an answer for the shipped input differs from the module's ANSWERS,
+- the backends of a day do not agree on an input,
+- an answer for the generated input differs from an exact reference
+  solver (see REFERENCES) or from the latest passed run in the history with
+  the same scale and seed,
+- a backend is more than tolerance slower than in that passed run.
+Each run (timings are best of repeats) is appended to a history file, one
+JSON object per line. The baseline of a day is the latest passed run of that
+day (so a run of some days does not hide the others). Only passed runs serve
+as baseline, so neither a speedup with a wrong answer nor a slowdown is ever
+accepted, e.g.
+
+	python regression.py --scale 10
+	python regression.py 5 11 --repeats 5 --tolerance 0.2
+"""
+from __future__ import annotations
+
+import json
+import sys
+from argparse import ArgumentParser
+from collections.abc import Callable
+from datetime import datetime, timezone
+from math import isqrt, prod
+from pathlib import Path
+from subprocess import run as run_process
+from time import perf_counter
+from typing import Any, TypeAlias
+
+from generators import generate, get_size
+from solvers import (DAYS_DIRECTORY, Backend, Solutions, discover_days,
+                     get_backends, get_day_module, get_input_path)
+
+Record: TypeAlias = dict[str, Any]
+
+DEFAULT_HISTORY = Path("regression_history.jsonl")
+
+# Timings closer than this (seconds) to the baseline are considered noise.
+MIN_SLOWDOWN = 0.001
+
+
+def count_ways_to_win(time: int, distance: int) -> int:
+	"""Return the nr of (integer) hold times h with h * (time - h) >
+	distance, in exact integer arithmetic."""
+
+	hold = (time - isqrt(max(time * time - 4 * distance, 0))) // 2
+	while hold <= time // 2 and hold * (time - hold) <= distance:
+		hold += 1
+	while hold > 0 and (hold - 1) * (time - hold + 1) > distance:
+		hold -= 1
+	return max(time - 2 * hold + 1, 0)
+
+
+def solve_day06_exactly(content: bytes) -> Solutions:
+	"""Return the Day06 solutions without floats (Day06 uses math.sqrt)."""
+
+	times, distances = get_day_module(6).parse(content)
+	return (prod(count_ways_to_win(int(time), int(distance))
+	             for time, distance in zip(times, distances)),
+	        count_ways_to_win(int("".join(times)), int("".join(distances))))
+
+
+# Exact solvers, independent of the backends, to check generated inputs.
+REFERENCES: dict[int, Callable[[bytes], Solutions]] = {6: solve_day06_exactly}
+
+
+def get_inputs(day: int, scale: float, seed: int) -> dict[str, bytes]:
+	"""Return a dict with key=input name and value=content of the shipped
+	(if present) and the generated input for day."""
+
+	inputs = {}
+	if (path := get_input_path(day)).exists():
+		inputs["shipped"] = path.read_bytes()
+	inputs["generated"] = generate(day, get_size(day, scale), seed).encode()
+	return inputs
+
+
+def time_backend(backend: Backend, content: bytes, repeats: int) \
+	-> tuple[Solutions, float]:
+	"""Return the solutions of backend for content and the best time of
+	repeats runs. Raise ValueError if the runs disagree."""
+
+	solutions_seen: set[Solutions] = set()
+	timings = []
+	for _ in range(repeats):
+		start_time = perf_counter()
+		solution_1, solution_2 = backend(content)
+		timings.append(perf_counter() - start_time)
+		solutions_seen.add((solution_1, solution_2))
+	if len(solutions_seen) > 1:
+		raise ValueError(f"different solutions in repeated runs: "
+		                 f"{sorted(solutions_seen)}")
+	return solutions_seen.pop(), min(timings)
+
+
+def run_day(day: int, scale: float, seed: int, repeats: int) \
+	-> tuple[Record, list[str]]:
+	"""Return the solutions and time per input and backend of day, and a
+	description of each failed check (against ANSWERS or REFERENCES and
+	across backends)."""
+
+	results: Record = {}
+	failures = []
+	answers = getattr(get_day_module(day), "ANSWERS", None)
+
+	for input_name, content in get_inputs(day, scale, seed).items():
+		results[input_name] = {}
+		if input_name == "shipped":
+			expected = None if answers is None else tuple(answers)
+		else:
+			expected = REFERENCES[day](content) if day in REFERENCES \
+				else None
+		for name, backend in get_backends(day).items():
+			try:
+				solutions, time = time_backend(backend, content, repeats)
+			except Exception as error:  # record, and check the others
+				failures.append(f"Day {day:02} {input_name} {name}: "
+				                f"{type(error).__name__}: {error}")
+				continue
+			results[input_name][name] = {"solutions": list(solutions),
+			                             "time": time}
+			if expected is not None and solutions != expected:
+				failures.append(f"Day {day:02} {input_name} {name}: "
+				                f"{solutions}, expected {expected}")
+
+		solutions_by_backend = {name: tuple(result["solutions"]) for name,
+		                        result in results[input_name].items()}
+		if len(set(solutions_by_backend.values())) > 1:
+			failures.append(f"Day {day:02} {input_name}: backends disagree "
+			                f"{solutions_by_backend}")
+
+	return results, failures
+
+
+def get_commit() -> str | None:
+	"""Return the current git commit (None if not in a git checkout)."""
+
+	process = run_process(["git", "rev-parse", "--short", "HEAD"],
+	                      cwd=DAYS_DIRECTORY, capture_output=True, text=True)
+	return process.stdout.strip() if process.returncode == 0 else None
+
+
+def run(days: list[int] | None = None, scale: float = 10.0, seed: int = 0,
+        repeats: int = 3) -> tuple[Record, list[str]]:
+	"""Run the requested days (all days if days is None). Return the record
+	for the history and the failed checks."""
+
+	selected = sorted(discover_days()) if days is None else days
+	record: Record = {
+		"timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+		"commit": get_commit(), "scale": scale, "seed": seed,
+		"repeats": repeats, "days": {}}
+	failures = []
+
+	for day in selected:
+		record["days"][f"{day:02}"], day_failures = \
+			run_day(day, scale, seed, repeats)
+		failures.extend(day_failures)
+
+	return record, failures
+
+
+def load_history(path: Path) -> list[Record]:
+	"""Return all records in the history file (none if it does not
+	exist)."""
+
+	if not path.exists():
+		return []
+	with open(path) as history_file:
+		return [json.loads(line) for line in history_file if line.strip()]
+
+
+def find_baselines(history: list[Record], scale: float, seed: int) \
+	-> Record:
+	"""Return a dict with key=day and value=the results of day in the latest
+	passed record with the same scale and seed that contains day."""
+
+	baselines: Record = {}
+	for record in history:
+		if record["passed"] and (record["scale"], record["seed"]) \
+			== (scale, seed):
+			baselines.update(record["days"])
+	return baselines
+
+
+def check_generated(record: Record, baselines: Record) -> list[str]:
+	"""Return a description of each generated input whose answers differ
+	from its baseline's (same scale and seed, so the same input)."""
+
+	failures = []
+
+	for day, day_results in record["days"].items():
+		base_results = baselines.get(day, {}).get("generated", {})
+		if not (expected := next(iter(base_results.values()), None)):
+			continue
+		for name, result in day_results.get("generated", {}).items():
+			if result["solutions"] != expected["solutions"]:
+				failures.append(f"Day {day} generated {name}: "
+				                f"{result['solutions']}, expected "
+				                f"{expected['solutions']}")
+
+	return failures
+
+
+def compare(record: Record, baselines: Record, tolerance: float) \
+	-> list[str]:
+	"""Return a description of each day/input/backend whose time is more
+	than tolerance (fraction) above the baseline."""
+
+	slowdowns = []
+
+	for day, day_results in record["days"].items():
+		for input_name, backends in day_results.items():
+			base_backends = baselines.get(day, {}).get(input_name, {})
+			for name, result in backends.items():
+				if not (base_result := base_backends.get(name)):
+					continue
+				base_time = base_result["time"]
+				if result["time"] > max(base_time * (1 + tolerance),
+				                        base_time + MIN_SLOWDOWN):
+					slowdowns.append(
+						f"Day {day} {input_name} {name}: "
+						f"{result['time'] * 1000:.2f} ms vs baseline "
+						f"{base_time * 1000:.2f} ms")
+
+	return slowdowns
+
+
+def print_record(record: Record, baselines: Record) -> None:
+	"""Print a table with the time per day, input and backend (and the
+	baseline's time, if any)."""
+
+	print(f"{'day':<5}{'input':<11}{'backend':<14}{'ms':>10}"
+	      f"{'base ms':>10}  solutions")
+	for day, day_results in record["days"].items():
+		for input_name, backends in day_results.items():
+			for name, result in backends.items():
+				base_result = baselines.get(day, {}).get(input_name, {}) \
+					.get(name, {})
+				base_ms = f"{base_result['time'] * 1000:.2f}" \
+					if base_result else ""
+				print(f"{day:<5}{input_name:<11}{name:<14}"
+				      f"{result['time'] * 1000:>10.2f}{base_ms:>10}  "
+				      f"{tuple(result['solutions'])}")
+
+
+def main() -> int:
+	"""Command line entry point. Return 1 if a check failed or a backend
+	got slower."""
+
+	parser = ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("days", nargs="*", type=int,
+	                    help="day nrs to run (default: all)")
+	parser.add_argument("--scale", type=float, default=10.0,
+	                    help="generated input size relative to default "
+	                         "(default: 10)")
+	parser.add_argument("--seed", type=int, default=0)
+	parser.add_argument("--repeats", type=int, default=3)
+	parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY,
+	                    help=f"JSON lines history file (default: "
+	                         f"{DEFAULT_HISTORY})")
+	parser.add_argument("--tolerance", type=float, default=0.1,
+	                    help="allowed slowdown (default: 0.1)")
+	args = parser.parse_args()
+
+	history = load_history(args.history)
+	baselines = find_baselines(history, args.scale, args.seed)
+	record, failures = run(args.days or None, args.scale, args.seed,
+	                       args.repeats)
+	failures.extend(check_generated(record, baselines))
+	slowdowns = compare(record, baselines, args.tolerance)
+	record["passed"] = not failures and not slowdowns
+
+	with open(args.history, "a") as history_file:
+		history_file.write(json.dumps(record) + "\n")
+
+	print_record(record, baselines)
+	if failures:
+		print("\n".join(["Wrong answers:", *failures]))
+	if slowdowns:
+		print("\n".join(["Slowdowns:", *slowdowns]))
+	return 0 if record["passed"] else 1
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,133 @@
+"""Before/after benchmark of the __slots__ records of Day03, 05, 07 and 10.
+
+The 'before' version of each record class is the same class without
+__slots__ (so with an instance __dict__). Per class the allocations and bytes
+per record and the construction time are measured. End-to-end, each day is
+parsed and solved on a generated input, once with the 'before' classes
+swapped into the module and once as is, e.g.
+
+	python slots_benchmark.py --records 100000 --scale 10
+"""
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from io import StringIO
+from time import perf_counter
+from tracemalloc import start, stop, take_snapshot
+from typing import Any
+
+from generators import generate, get_size
+from solvers import get_day_module
+
+# For each day: (class name, function returning constructor arguments).
+RECORDS: dict[int, list[tuple[str, Callable[[int], tuple[Any, ...]]]]] = {
+	3: [("NumberInfo", lambda i: (i, False)),
+	    ("SymbolInfo", lambda i: ("*", [])),
+	    ("RowColRanges", lambda i: ((i - 1, i, i + 1), (i, i + 1, i + 2)))],
+	5: [("Interval", lambda i: (i, i + 10)),
+	    ("MapLine", lambda i: (None, i))],
+	7: [("PokerHand", lambda i: (1, f"{i:05}", i))],
+	10: [("Tile", lambda i: ("|",))]}
+
+
+def without_slots(cls: type) -> type:
+	"""Return a copy of cls without __slots__ (instances get a __dict__)."""
+
+	slots = set(getattr(cls, "__slots__", ()))
+	namespace = {name: value for name, value in vars(cls).items()
+	             if name not in slots | {"__slots__", "__dict__",
+	                                     "__weakref__"}}
+	return type(cls.__name__, cls.__bases__, namespace)
+
+
+def measure_records(cls: type, arguments: Callable[[int], tuple[Any, ...]],
+                    nr_records: int) -> tuple[float, float, float]:
+	"""Return allocations per record, bytes per record and construction time
+	per record (ns) for nr_records instances of cls."""
+
+	all_arguments = [arguments(i) for i in range(nr_records)]
+	records: list[object] = [None] * nr_records
+
+	start()
+	try:
+		for i, args in enumerate(all_arguments):
+			records[i] = cls(*args)
+		statistics = take_snapshot().statistics("filename")
+	finally:
+		stop()
+	nr_allocations = sum(stat.count for stat in statistics)
+	nr_bytes = sum(stat.size for stat in statistics)
+
+	start_time = perf_counter()
+	for i, args in enumerate(all_arguments):
+		records[i] = cls(*args)
+	elapsed = perf_counter() - start_time
+
+	return (nr_allocations / nr_records, nr_bytes / nr_records,
+	        elapsed / nr_records * 1e9)
+
+
+@contextmanager
+def slots_removed(day: int) -> Iterator[None]:
+	"""Temporarily replace the day's record classes by their versions
+	without __slots__ (the day's functions look them up as globals)."""
+
+	module = get_day_module(day)
+	originals = {name: getattr(module, name) for name, _ in RECORDS[day]}
+	try:
+		for name, cls in originals.items():
+			setattr(module, name, without_slots(cls))
+		yield
+	finally:
+		for name, cls in originals.items():
+			setattr(module, name, cls)
+
+
+def time_day(day: int, text: str, repeats: int) -> float:
+	"""Return the best time of repeats runs of parse and solve_parsed."""
+
+	module = get_day_module(day)
+	timings = []
+	for _ in range(repeats):
+		start_time = perf_counter()
+		module.solve_parsed(module.parse(StringIO(text)))
+		timings.append(perf_counter() - start_time)
+	return min(timings)
+
+
+def main() -> None:
+	"""Command line entry point: print both tables."""
+
+	parser = ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument("--records", type=int, default=100_000,
+	                    help="nr of records per class (default: 100000)")
+	parser.add_argument("--scale", type=float, default=10.0,
+	                    help="input size relative to default (default: 10)")
+	parser.add_argument("--repeats", type=int, default=3)
+	args = parser.parse_args()
+
+	print(f"{'record':<14}{'':<8}{'allocs':>8}{'bytes':>8}{'ns':>8}")
+	for day, records in RECORDS.items():
+		module = get_day_module(day)
+		for name, arguments in records:
+			cls = getattr(module, name)
+			for label, variant in (("before", without_slots(cls)),
+			                       ("after", cls)):
+				allocations, nr_bytes, time = \
+					measure_records(variant, arguments, args.records)
+				print(f"{name:<14}{label:<8}{allocations:>8.2f}"
+				      f"{nr_bytes:>8.1f}{time:>8.0f}")
+
+	print(f"\n{'day':<6}{'before ms':>12}{'after ms':>12}")
+	for day in RECORDS:
+		text = generate(day, get_size(day, args.scale))
+		with slots_removed(day):
+			before = time_day(day, text, args.repeats)
+		after = time_day(day, text, args.repeats)
+		print(f"{day:<6}{before * 1000:>12.1f}{after * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,100 @@
+"""Library access to the day solvers.
+
+Every DayNN_*.py module provides parse(source) and solve_parsed(data), where
+source is a stream or buffer (see streams.py). The functions below find the
+modules, import each only once (so module-level tables and compiled patterns
+are shared by all inputs) and solve one or many inputs, optionally using a
+ParseCache, e.g.
+
+	solve_batch(7, [Path("a.txt"), b"32T3K 765\\n..."], ParseCache())
+
+A module may also define BACKENDS: alternative solvers (functions from a
+source to the solutions) by name, next to the "default" parse + solve_parsed
+(see get_backends and regression.py).
+"""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from functools import lru_cache
+from importlib import import_module
+from os import PathLike
+from pathlib import Path
+from types import ModuleType
+from typing import TypeAlias
+
+from instrument import phase
+from parse_cache import ParseCache
+from streams import Source
+
+Solutions: TypeAlias = tuple[int, int]
+Input: TypeAlias = Source | PathLike[str]
+Backend: TypeAlias = Callable[[Source], Solutions]
+
+DAYS_DIRECTORY = Path(__file__).resolve().parent
+
+
+def discover_days(directory: Path = DAYS_DIRECTORY) -> dict[int, str]:
+	"""Return a dict with key=day nr and value=module name for all DayNN_*.py
+	modules in directory."""
+
+	return {int(path.name[3:5]): path.stem
+	        for path in sorted(directory.glob("Day[0-9][0-9]_*.py"))}
+
+
+@lru_cache(maxsize=None)
+def get_day_module(day: int) -> ModuleType:
+	"""Return the (imported) module for day."""
+
+	return import_module(discover_days()[day])
+
+
+def get_backends(day: int) -> dict[str, Backend]:
+	"""Return a dict with key=name and value=solver for all backends of day,
+	starting with "default" (parse followed by solve_parsed)."""
+
+	module = get_day_module(day)
+
+	def default(source: Source) -> Solutions:
+		solutions: Solutions = module.solve_parsed(module.parse(source))
+		return solutions
+
+	return {"default": default, **getattr(module, "BACKENDS", {})}
+
+
+def get_input_path(day: int) -> Path:
+	"""Return the path of the shipped input file for day."""
+
+	return DAYS_DIRECTORY / f"Day{day:02}_input.txt"
+
+
+def parse(day: int, source: Input, cache: ParseCache | None = None) \
+	-> object:
+	"""Return the parsed input for day (from cache, if given). A path is
+	opened in binary mode."""
+
+	module = get_day_module(day)
+	if isinstance(source, PathLike):
+		with open(source, "rb") as input_file:
+			return parse(day, input_file, cache)
+	with phase(f"{module.__name__}.parse"):
+		if cache is not None:
+			return cache.parse(module, source)
+		return module.parse(source)
+
+
+def solve_source(day: int, source: Input, cache: ParseCache | None = None) \
+	-> Solutions:
+	"""Return the solutions for day for a single input."""
+
+	module = get_day_module(day)
+	data = parse(day, source, cache)
+	with phase(f"{module.__name__}.solve_parsed"):
+		solutions: Solutions = module.solve_parsed(data)
+	return solutions
+
+
+def solve_batch(day: int, sources: Iterable[Input],
+                cache: ParseCache | None = None) -> list[Solutions]:
+	"""Return the solutions for day for each of the inputs."""
+
+	return [solve_source(day, source, cache) for source in sources]
@@ -0,0 +1,37 @@
+"""Input sources for the day solvers' parse() functions.
+
+A source is a text stream, a binary stream or a buffer (str, bytes,
+bytearray or memoryview) holding the complete puzzle input. Note that a str
+is the input itself, not a file name.
+"""
+from __future__ import annotations
+
+from io import StringIO
+from typing import BinaryIO, TextIO, TypeAlias, cast
+
+Buffer: TypeAlias = str | bytes | bytearray | memoryview
+Source: TypeAlias = TextIO | BinaryIO | Buffer
+
+
+def as_text_stream(source: Source) -> TextIO:
+	"""Return a text stream reading source (source itself if it already is a
+	text stream)."""
+
+	if isinstance(source, str):
+		return StringIO(source)
+	if isinstance(source, (bytes, bytearray, memoryview)):
+		return StringIO(bytes(source).decode())
+	if isinstance(source.read(0), str):
+		return cast(TextIO, source)
+	return StringIO(cast(BinaryIO, source).read().decode())
+
+
+def as_bytes(source: Source) -> bytes:
+	"""Return the (remaining) contents of source as bytes."""
+
+	if isinstance(source, str):
+		return source.encode()
+	if isinstance(source, (bytes, bytearray, memoryview)):
+		return bytes(source)
+	content = source.read()
+	return content.encode() if isinstance(content, str) else content